@@ -15,16 +15,24 @@ Features:
 
 import streamlit as st
 import os
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from dotenv import load_dotenv
+import orjson
+import zstandard
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Import our services
-from services.parser import ProjectParser
-from graph import ArticleGenerationWorkflow
+# Import our services. The article workflow (LangGraph + LLM SDKs) is imported
+# on first use so the page can render before those heavy modules load.
+from services.parser import ProjectParser, archive_fingerprint
 
 # Page configuration
 st.set_page_config(
@@ -34,8 +42,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling (static; built once per process, emitted on every rerun)
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -56,16 +64,166 @@ st.markdown("""
         border-radius: 0.5rem;
         margin: 0.5rem 0;
     }
-    .file-info {
-        background-color: #e8f4fd;
-        padding: 0.5rem;
-        border-radius: 0.3rem;
-        margin: 0.25rem 0;
-        font-family: monospace;
-        font-size: 0.9rem;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Static "How to Use" instructions shown in the main pane
+HOW_TO_USE_LEFT = """
+**1. Upload Your Project**
+- Zip your project folder
+- Upload the archive (max 20MB)
+- Supported: ZIP, TAR.GZ
+
+**2. Configure Settings**
+- Choose analysis depth
+- Select article tone
+- Pick LLM provider
+"""
+
+HOW_TO_USE_RIGHT = """
+**3. Generate Article**
+- Click "Generate Article"
+- Wait for processing (≤60s)
+- Review and download
+
+**4. Share Your Work**
+- Copy to clipboard
+- Download as Markdown
+- Publish to your blog
+"""
+
+# API key input settings for each LLM provider. Offline-only providers (the Batch API,
+# whose jobs can take hours) are deliberately not offered in the interactive app
+PROVIDER_SPECS: Dict[str, Dict[str, str]] = {
+    "OpenAI GPT-4": {
+        "label": "OpenAI API Key:",
+        "help": "Enter your OpenAI API key. Get one at https://platform.openai.com/api-keys",
+        "placeholder": "sk-...",
+        "warn": "OpenAI API key required for GPT-4"
+    },
+    "Anthropic Claude": {
+        "label": "Anthropic API Key:",
+        "help": "Enter your Anthropic API key. Get one at https://console.anthropic.com/",
+        "placeholder": "sk-ant-...",
+        "warn": "Anthropic API key required for Claude"
+    },
+    "Google Gemini": {
+        "label": "Google API Key:",
+        "help": "Enter your Google API key. Get one at https://makersuite.google.com/app/apikey",
+        "placeholder": "AIza...",
+        "warn": "Google API key required for Gemini"
+    }
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_workflow():
+    """Shared workflow, so LLM clients and compiled graphs survive reruns."""
+    from graph import ArticleGenerationWorkflow
+    return ArticleGenerationWorkflow()
+
+
+# Largest accepted upload
+MAX_UPLOAD_MB = 20
+
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def parse_project_cached(archive_fingerprint: str, file_name: str, depth: str, _uploaded_file) -> Optional[Dict]:
+    """
+    Parse a project archive, memoized on its contents so settings changes skip re-parsing.
+    
+    The upload itself is excluded from the cache key (leading underscore); the
+    fingerprint stands in for its contents.
+    """
+    parser = ProjectParser(max_size_mb=MAX_UPLOAD_MB, cache_dir=".parser_cache")
+    return parser.process_project(uploaded_file=_uploaded_file, depth=depth, fingerprint=archive_fingerprint)
+
+
+# Worker threads for archive parsing, shared by all sessions
+PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="project-parser")
+
+
+def parse_project_in_background(status, archive_fingerprint: str, file_name: str, depth: str,
+                                uploaded_file) -> Optional[Dict]:
+    """Run parse_project_cached on a worker thread, ticking the status label until it finishes."""
+    ctx = get_script_run_ctx()
+    
+    def run():
+        # Attach the session's script context so st.cache_data works on the worker
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return parse_project_cached(archive_fingerprint, file_name, depth, uploaded_file)
+    
+    future = PARSE_EXECUTOR.submit(run)
+    started = time.monotonic()
+    while not wait([future], timeout=0.5).done:
+        status.update(label=f"🔄 Analyzing project... ({time.monotonic() - started:.0f}s)")
+    return future.result()
+
+
+# Minimum interval between live preview redraws while section text streams in
+PREVIEW_REFRESH_SECONDS = 0.1
+
+
+def preview_markdown(sections: Dict[int, str], partial: Dict[int, str]) -> str:
+    """Join finished and in-progress sections in plan order for the live preview."""
+    return "".join(sections.get(i) or partial[i] for i in sorted(sections.keys() | partial.keys()))
+
+
+async def stream_article(workflow, analysis_result: Dict,
+                         workflow_config: Dict, placeholder, status) -> Dict:
+    """Run the workflow, rendering sections into the placeholder as they stream in."""
+    sections = {}
+    partial = {}  # section index -> text received so far, until the section finishes
+    last_render = 0.0
+    async for event in workflow.astream_article(analysis_result, workflow_config):
+        if event["event"] == "plan_section":
+            status.update(label=f"🤖 Planning article ({event['index'] + 1} sections planned)...")
+        elif event["event"] == "section_chunk":
+            partial[event["index"]] = partial.get(event["index"], "") + event["text"]
+            # Chunks arrive far faster than the page needs to redraw
+            if time.monotonic() - last_render >= PREVIEW_REFRESH_SECONDS:
+                placeholder.markdown(preview_markdown(sections, partial))
+                last_render = time.monotonic()
+        elif event["event"] == "section":
+            sections[event["index"]] = event["content"]
+            partial.pop(event["index"], None)
+            status.update(label=f"✍️ Writing sections ({len(sections)}/{event['total']})...")
+            placeholder.markdown(preview_markdown(sections, partial))
+            last_render = time.monotonic()
+        elif event["event"] == "complete":
+            return event["result"]
+
+
+def pack_state(value) -> bytes:
+    """Compress a JSON-serializable value for storage in session state."""
+    return zstandard.ZstdCompressor(level=3).compress(orjson.dumps(value))
+
+
+def unpack_state(blob: bytes):
+    """Inverse of pack_state."""
+    return orjson.loads(zstandard.ZstdDecompressor().decompress(blob))
+
+
+def analysis_summary(analysis: Dict) -> Dict:
+    """
+    Keep only what the results pane displays from a project analysis.
+    
+    The full file lists are needed by the workflow but not by the UI, which shows
+    counts, the README/config files and the first few code files (code_files_head).
+    """
+    file_tree = analysis["file_tree"]
+    return {
+        "total_files": analysis["total_files"],
+        "code_files": analysis["code_files"],
+        "readme_files": analysis["readme_files"],
+        "config_files": analysis["config_files"],
+        "file_tree": {
+            "readme_files": file_tree["readme_files"],
+            "config_files": file_tree["config_files"]
+        },
+        "code_files_head": analysis["code_files_head"]
+    }
 
 
 def initialize_session_state():
@@ -76,6 +234,9 @@ def initialize_session_state():
         st.session_state.generated_article = None
     if "processing_status" not in st.session_state:
         st.session_state.processing_status = "idle"
+    if "thread_id" not in st.session_state:
+        # Scopes LangGraph checkpoints to this browser session
+        st.session_state.thread_id = uuid.uuid4().hex
 
 
 def render_header():
@@ -91,105 +252,85 @@ def render_sidebar():
     """Render the sidebar with all configuration options (FR-6)."""
     st.sidebar.markdown('<h2 class="sidebar-header">⚙️ Configuration</h2>', unsafe_allow_html=True)
     
-    # File Upload Section (US-1, FR-1)
-    st.sidebar.markdown("### 📁 Project Upload")
-    uploaded_file = st.sidebar.file_uploader(
-        "Upload your project archive",
-        type=['zip', 'tar.gz', 'tgz'],
-        help="Upload a ZIP or TAR.GZ file containing your project (max 20MB)"
-    )
-    
-    if uploaded_file:
-        st.sidebar.success(f"✅ Uploaded: {uploaded_file.name}")
-        st.sidebar.info(f"Size: {uploaded_file.size / 1024 / 1024:.1f} MB")
-    
-    # Analysis Depth Selection (US-2, FR-2)
-    st.sidebar.markdown("### 🔍 Analysis Depth")
-    analysis_depth = st.sidebar.radio(
-        "Choose analysis depth:",
-        options=["Overview", "Detailed"],
-        help="Overview: README & top-level files only. Detailed: Full source code analysis."
-    )
-    
-    # Article Tone Selection (US-3, FR-4)
-    st.sidebar.markdown("### 🎭 Article Tone")
-    article_tone = st.sidebar.selectbox(
-        "Select article tone:",
-        options=["Explanatory", "Conversational", "Marketing"],
-        help="Explanatory: Neutral/educational. Conversational: Casual/first-person. Marketing: Persuasive/product-focused."
-    )
-    
     # LLM Provider Selection (US-4, FR-5)
+    # Kept outside the form so the API key field below follows the chosen provider
     st.sidebar.markdown("### 🤖 LLM Provider")
     llm_provider = st.sidebar.selectbox(
         "Choose LLM provider:",
-        options=["OpenAI GPT-4", "Anthropic Claude", "Google Gemini"],
+        options=list(PROVIDER_SPECS),
         help="Select your preferred AI model for article generation"
     )
+    spec = PROVIDER_SPECS[llm_provider]
     
-    # API Key Management
-    st.sidebar.markdown("### 🔑 API Configuration")
-    
-    # Show API key input based on selected provider
-    api_key = None
-    if llm_provider == "OpenAI GPT-4":
-        api_key = st.sidebar.text_input(
-            "OpenAI API Key:",
-            type="password",
-            help="Enter your OpenAI API key. Get one at https://platform.openai.com/api-keys",
-            placeholder="sk-..."
+    # The remaining controls only commit on submit, so editing them doesn't rerun the script
+    with st.sidebar.form("config"):
+        # File Upload Section (US-1, FR-1)
+        st.markdown("### 📁 Project Upload")
+        uploaded_file = st.file_uploader(
+            "Upload your project archive",
+            type=['zip', 'tar.gz', 'tgz'],
+            help="Upload a ZIP or TAR.GZ file containing your project (max 20MB)"
         )
-        if not api_key:
-            st.sidebar.warning("⚠️ OpenAI API key required for GPT-4")
-    elif llm_provider == "Anthropic Claude":
-        api_key = st.sidebar.text_input(
-            "Anthropic API Key:",
-            type="password",
-            help="Enter your Anthropic API key. Get one at https://console.anthropic.com/",
-            placeholder="sk-ant-..."
+        
+        # Analysis Depth Selection (US-2, FR-2)
+        st.markdown("### 🔍 Analysis Depth")
+        analysis_depth = st.radio(
+            "Choose analysis depth:",
+            options=["Overview", "Detailed"],
+            help="Overview: README & top-level files only. Detailed: Full source code analysis."
+        )
+        
+        # Article Tone Selection (US-3, FR-4)
+        st.markdown("### 🎭 Article Tone")
+        article_tone = st.selectbox(
+            "Select article tone:",
+            options=["Explanatory", "Conversational", "Marketing"],
+            help="Explanatory: Neutral/educational. Conversational: Casual/first-person. Marketing: Persuasive/product-focused."
         )
-        if not api_key:
-            st.sidebar.warning("⚠️ Anthropic API key required for Claude")
-    elif llm_provider == "Google Gemini":
-        api_key = st.sidebar.text_input(
-            "Google API Key:",
+        
+        # API Key Management
+        st.markdown("### 🔑 API Configuration")
+        api_key = st.text_input(
+            spec["label"],
             type="password",
-            help="Enter your Google API key. Get one at https://makersuite.google.com/app/apikey",
-            placeholder="AIza..."
+            help=spec["help"],
+            placeholder=spec["placeholder"]
+        )
+        
+        # Meta Settings (US-5)
+        st.markdown("### 📝 Article Settings")
+        article_title = st.text_input(
+            "Article Title (optional):",
+            placeholder="e.g., Building a YouTube Summarizer with Python",
+            help="Custom title for your article. Leave empty for auto-generation."
+        )
+        
+        target_audience = st.selectbox(
+            "Target Audience:",
+            options=["Beginner", "Intermediate", "Advanced"],
+            help="Technical level of your target readers"
+        )
+        
+        generate_button = st.form_submit_button(
+            "🚀 Generate Article",
+            type="primary",
+            use_container_width=True
         )
-        if not api_key:
-            st.sidebar.warning("⚠️ Google API key required for Gemini")
-    
-    # Meta Settings (US-5)
-    st.sidebar.markdown("### 📝 Article Settings")
-    article_title = st.sidebar.text_input(
-        "Article Title (optional):",
-        placeholder="e.g., Building a YouTube Summarizer with Python",
-        help="Custom title for your article. Leave empty for auto-generation."
-    )
-    
-    target_audience = st.sidebar.selectbox(
-        "Target Audience:",
-        options=["Beginner", "Intermediate", "Advanced"],
-        help="Technical level of your target readers"
-    )
     
-    # Generate Button
-    st.sidebar.markdown("---")
+    # Submitted values; these reflect the state as of the last submit
+    if uploaded_file:
+        st.sidebar.success(f"✅ Uploaded: {uploaded_file.name}")
+        st.sidebar.info(f"Size: {uploaded_file.size / 1024 / 1024:.1f} MB")
+    elif generate_button:
+        st.sidebar.warning("⚠️ Please upload a project archive first")
     
     # Show provider info
     if api_key:
         st.sidebar.success(f"✅ {llm_provider} configured")
     else:
+        st.sidebar.warning(f"⚠️ {spec['warn']}")
         st.sidebar.info("ℹ️ Using mock LLM for testing")
     
-    generate_button = st.sidebar.button(
-        "🚀 Generate Article",
-        type="primary",
-        use_container_width=True,
-        disabled=uploaded_file is None
-    )
-    
     return {
         "uploaded_file": uploaded_file,
         "analysis_depth": analysis_depth.lower(),
@@ -202,21 +343,22 @@ def render_sidebar():
     }
 
 
+def render_file_table(files: List[Dict]):
+    """Render a list of file infos as a one-column table of paths."""
+    st.dataframe(
+        {"Path": [file_info["path"] for file_info in files]},
+        hide_index=True,
+        use_container_width=True
+    )
+
+
 def render_main_pane():
     """Render the main content pane."""
-    # Status and Progress Section
-    if st.session_state.processing_status == "processing":
-        with st.spinner("🔄 Analyzing project..."):
-            st.info("Extracting and analyzing project files.")
-    elif st.session_state.processing_status == "analyzing":
-        with st.spinner("🤖 Generating article with AI..."):
-            st.info("This may take up to 60 seconds for article generation.")
-    
     # Project Analysis Results
     if st.session_state.project_analysis:
         st.markdown("### 📊 Project Analysis Results")
         
-        analysis = st.session_state.project_analysis
+        analysis = unpack_state(st.session_state.project_analysis)
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
@@ -232,26 +374,26 @@ def render_main_pane():
         with st.expander("📁 View Project Structure", expanded=False):
             file_tree = analysis["file_tree"]
             
+            # Each file list is rendered as a single table widget
+            
             # Show README files
             if file_tree["readme_files"]:
                 st.markdown("**README Files:**")
-                for readme in file_tree["readme_files"]:
-                    st.markdown(f'<div class="file-info">📄 {readme["path"]}</div>', unsafe_allow_html=True)
+                render_file_table(file_tree["readme_files"])
             
             # Show config files
             if file_tree["config_files"]:
                 st.markdown("**Configuration Files:**")
-                for config in file_tree["config_files"]:
-                    st.markdown(f'<div class="file-info">⚙️ {config["path"]}</div>', unsafe_allow_html=True)
+                render_file_table(file_tree["config_files"])
             
-            # Show code files (limited for overview)
-            if file_tree["code_files"]:
+            # Show code files (only the first few are kept for display)
+            if analysis["code_files_head"]:
                 st.markdown("**Code Files:**")
-                for code_file in file_tree["code_files"][:10]:  # Show first 10
-                    st.markdown(f'<div class="file-info">💻 {code_file["path"]}</div>', unsafe_allow_html=True)
+                render_file_table(analysis["code_files_head"])
                 
-                if len(file_tree["code_files"]) > 10:
-                    st.info(f"... and {len(file_tree['code_files']) - 10} more code files")
+                remaining = analysis["code_files"] - len(analysis["code_files_head"])
+                if remaining > 0:
+                    st.info(f"... and {remaining} more code files")
     
     # Generated Article Display (US-6)
     if st.session_state.generated_article:
@@ -283,30 +425,10 @@ def render_main_pane():
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
-            **1. Upload Your Project**
-            - Zip your project folder
-            - Upload the archive (max 20MB)
-            - Supported: ZIP, TAR.GZ
-            
-            **2. Configure Settings**
-            - Choose analysis depth
-            - Select article tone
-            - Pick LLM provider
-            """)
+            st.markdown(HOW_TO_USE_LEFT)
         
         with col2:
-            st.markdown("""
-            **3. Generate Article**
-            - Click "Generate Article"
-            - Wait for processing (≤60s)
-            - Review and download
-            
-            **4. Share Your Work**
-            - Copy to clipboard
-            - Download as Markdown
-            - Publish to your blog
-            """)
+            st.markdown(HOW_TO_USE_RIGHT)
         
 
 
@@ -317,52 +439,71 @@ def process_project_upload(config: Dict):
     
     st.session_state.processing_status = "processing"
     
-    try:
-        # Initialize parser
-        parser = ProjectParser(max_size_mb=20)
-        
-        # Process the project
-        analysis_result = parser.process_project(
-            uploaded_file=config["uploaded_file"],
-            depth=config["analysis_depth"]
-        )
-        
-        if analysis_result:
-            st.session_state.project_analysis = analysis_result
-            st.session_state.processing_status = "analyzing"
-            
-            # Initialize the article generation workflow
-            workflow = ArticleGenerationWorkflow()
-            
-            # Create a serializable config for LangGraph (remove UploadedFile object)
-            workflow_config = {
-                "analysis_depth": config["analysis_depth"],
-                "article_tone": config["article_tone"],
-                "llm_provider": config["llm_provider"],
-                "api_key": config.get("api_key"),
-                "article_title": config["article_title"],
-                "target_audience": config["target_audience"]
-            }
+    # Single status container for every phase of the run
+    with st.status("🔄 Analyzing project...", expanded=True) as status:
+        try:
+            # Process the project (cached per archive contents and depth). The hash pass
+            # also checks the actual size, which the reported one may understate
+            project_fingerprint = archive_fingerprint(config["uploaded_file"], MAX_UPLOAD_MB * 1024 * 1024)
+            if project_fingerprint is None:
+                st.error(f"❌ The uploaded file exceeds the maximum allowed size ({MAX_UPLOAD_MB}MB).")
+                st.session_state.processing_status = "idle"
+                status.update(label="❌ Project processing failed", state="error")
+                return
             
-            # Run the LangGraph workflow
-            with st.spinner("🤖 Generating article with AI..."):
-                workflow_result = workflow.run_workflow(analysis_result, workflow_config)
+            analysis_result = parse_project_in_background(
+                status,
+                project_fingerprint,
+                config["uploaded_file"].name,
+                config["analysis_depth"],
+                config["uploaded_file"]
+            )
             
-            if workflow_result["success"]:
-                st.session_state.generated_article = workflow_result["article"]
-                st.session_state.processing_status = "completed"
-                st.success("✅ Article generated successfully!")
+            if analysis_result:
+                # Only the displayed summary is kept, compressed, for the rest of the session
+                st.session_state.project_analysis = pack_state(analysis_summary(analysis_result))
+                st.session_state.processing_status = "analyzing"
+                status.update(label="🤖 Planning article with AI (this may take up to 60 seconds)...")
+                
+                # Get the shared article generation workflow
+                workflow = get_workflow()
+                
+                # Create a serializable config for LangGraph (remove UploadedFile object)
+                workflow_config = {
+                    "analysis_depth": config["analysis_depth"],
+                    "article_tone": config["article_tone"],
+                    "llm_provider": config["llm_provider"],
+                    "api_key": config.get("api_key"),
+                    "article_title": config["article_title"],
+                    "target_audience": config["target_audience"],
+                    # Identifies the archive contents for the article cache
+                    "project_fingerprint": project_fingerprint,
+                    "thread_id": st.session_state.thread_id
+                }
+                
+                # Run the LangGraph workflow, previewing sections as they are written
+                preview = st.empty()
+                workflow_result = asyncio.run(stream_article(workflow, analysis_result, workflow_config, preview, status))
+                preview.empty()
+                
+                if workflow_result["success"]:
+                    st.session_state.generated_article = workflow_result["article"]
+                    st.session_state.processing_status = "completed"
+                    status.update(label="✅ Article generated successfully!", state="complete", expanded=False)
+                else:
+                    st.error(f"❌ Article generation failed: {workflow_result.get('error', 'Unknown error')}")
+                    st.session_state.processing_status = "idle"
+                    status.update(label="❌ Article generation failed", state="error")
+                
             else:
-                st.error(f"❌ Article generation failed: {workflow_result.get('error', 'Unknown error')}")
+                st.error("❌ Failed to process project. Please check your upload and try again.")
                 st.session_state.processing_status = "idle"
-            
-        else:
-            st.error("❌ Failed to process project. Please check your upload and try again.")
+                status.update(label="❌ Project processing failed", state="error")
+                
+        except Exception as e:
+            st.error(f"❌ An error occurred: {str(e)}")
             st.session_state.processing_status = "idle"
-            
-    except Exception as e:
-        st.error(f"❌ An error occurred: {str(e)}")
-        st.session_state.processing_status = "idle"
+            status.update(label="❌ An error occurred", state="error")
 
 
 def main():
@@ -12,44 +12,109 @@ Example:
     workflow.run_workflow(project_analysis, config)
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any
-from .nodes import create_workflow_graph, WorkflowState
-from services.llm_factory import LLMFactory
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, Optional
+
+import orjson
+from .nodes import create_workflow_graph, is_degraded_article, WorkflowState
+from services.llm_factory import LLMFactory, MockLLMClient, SemanticCachingLLMClient
+from services.article_cache import ArticleCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Checkpoint thread used when the caller does not supply one
+DEFAULT_THREAD_ID = "default"
+
+# Interrupted threads whose checkpoints are kept so a retry can resume them; past this
+# many, the oldest are deleted. Threads that run to the end are deleted right away.
+MAX_INTERRUPTED_THREADS = 32
+
+# Config keys kept out of the workflow state, which is checkpointed. The API key only
+# needs to reach the LLM client, which travels in configurable and is never stored
+# (plain string configurable values would be copied into the checkpoint metadata).
+UNCHECKPOINTED_CONFIG_KEYS = frozenset({"api_key"})
+
+# Initial workflow state; create_workflow_state copies it and fills in the inputs
+_EMPTY_STATE_TEMPLATE: WorkflowState = {
+    "project_analysis": None,  # contains info about the project files
+    "config": None,            # desired tone and depth
+    "extracted_content": None,
+    "article_plan": None,
+    "generated_sections": None,
+    "final_article": None,
+    "error": None
+}
+
 
 class ArticleGenerationWorkflow:
     """Main workflow for generating articles from project analysis using LangGraph."""
     
-    def __init__(self):
-        self.llm_factory = LLMFactory() # responsible for creating a client for a specific LLM provider
-        self._workflow = None           # responsible for creating the workflow graph
+    def __init__(self, article_cache: Optional[ArticleCache] = None,
+                 llm_factory: Optional[LLMFactory] = None):
+        # Responsible for creating a client for a specific LLM provider. The default factory
+        # only offers the interactive providers; scripted runs may pass
+        # LLMFactory(allow_offline=True) to use the Batch API
+        self.llm_factory = llm_factory or LLMFactory()
+        self._workflow = None           # compiled once; the client is passed per run
+        self.article_cache = article_cache or ArticleCache() # previously generated articles
+        self._interrupted_threads = OrderedDict()  # thread_id -> None, oldest first
+        self._threads_lock = threading.Lock()
     
-    def _get_workflow(self, llm_client):
-        """Get or create the LangGraph workflow."""
+    def _get_workflow(self):
+        """Get or create the LangGraph workflow, shared by all providers."""
         if self._workflow is None:
-            self._workflow = create_workflow_graph(llm_client) # creates the workflow graph
+            self._workflow = create_workflow_graph() # creates the workflow graph
         return self._workflow
     
+    @staticmethod
+    def llm_cache_scope(project_analysis: Dict, config: Dict) -> str:
+        """
+        Identify a run's project data and settings, so the semantic LLM response cache
+        only matches prompts written from the same inputs.
+        """
+        project = config.get("project_fingerprint") or hashlib.sha256(
+            orjson.dumps(project_analysis, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return hashlib.sha256(orjson.dumps([project, *ArticleCache.settings_key(config)])).hexdigest()
+    
+    def release_thread(self, workflow, thread_id: str, interrupted: bool) -> None:
+        """
+        Delete a run's checkpoints once they can no longer be resumed.
+        
+        The compiled graph (and its in-memory checkpointer) is shared by every session,
+        so finished threads are deleted immediately; interrupted ones are kept for a
+        retry, up to MAX_INTERRUPTED_THREADS.
+        """
+        with self._threads_lock:
+            self._interrupted_threads.pop(thread_id, None)
+            if interrupted:
+                self._interrupted_threads[thread_id] = None
+                expired = []
+                while len(self._interrupted_threads) > MAX_INTERRUPTED_THREADS:
+                    expired.append(self._interrupted_threads.popitem(last=False)[0])
+            else:
+                expired = [thread_id]
+        
+        for expired_thread_id in expired:
+            workflow.checkpointer.delete_thread(expired_thread_id)
+    
     def create_workflow_state(self, project_analysis: Dict, config: Dict) -> WorkflowState:
         """Create the initial state for the workflow."""
-        return {
-            "project_analysis": project_analysis,  # contains info about the project files
-            "config": config,                      # desired tone and depth
-            "extracted_content": None,
-            "article_plan": None,
-            "generated_sections": None,
-            "final_article": None,
-            "error": None
-        }
+        state = _EMPTY_STATE_TEMPLATE.copy()
+        state["project_analysis"] = project_analysis
+        state["config"] = config
+        return state
     
     def run_workflow(self, project_analysis: Dict, config: Dict) -> Dict:
         """
         Run the complete article generation workflow using LangGraph.
         
+        Synchronous wrapper around arun_workflow for callers without an event loop.
+        
         Args:
             project_analysis: Results from project parsing
             config: User configuration (tone, depth, etc.)
@@ -57,55 +122,147 @@ class ArticleGenerationWorkflow:
         Returns:
             Dictionary containing the final article and workflow state
         """
+        return asyncio.run(self.arun_workflow(project_analysis, config))
+    
+    async def arun_workflow(self, project_analysis: Dict, config: Dict) -> Dict:
+        """
+        Run the complete article generation workflow asynchronously.
+        
+        LLM calls are awaited, so section generation runs concurrently.
+        
+        Args:
+            project_analysis: Results from project parsing
+            config: User configuration (tone, depth, etc.)
+            
+        Returns:
+            Dictionary containing the final article and workflow state
+        """
+        async for event in self.astream_article(project_analysis, config):
+            if event["event"] == "complete":
+                return event["result"]
+    
+    async def astream_article(self, project_analysis: Dict, config: Dict) -> AsyncIterator[Dict]:
+        """
+        Run the workflow, yielding article sections as they are generated.
+        
+        Yields:
+            {"event": "plan_section", "index", "heading"} for each section as the planner
+            writes it, {"event": "section_chunk", "index", "text"} for each piece of a
+            section's body as it streams in, {"event": "section", "index", "total", "content"}
+            for each finished section (in completion order), then {"event": "complete", "result"}
+            with the same dictionary run_workflow returns
+        """
         logger.info("Starting LangGraph article generation workflow")
         
+        workflow = None
+        thread_id = config.get("thread_id", DEFAULT_THREAD_ID)
         try:
             # Create LLM client
             api_key = config.get("api_key")
-            llm_client = self.llm_factory.create_client(config["llm_provider"], api_key)
+            llm_client = self.llm_factory.create_client(config["llm_provider"], api_key,
+                                                      cache=config.get("cache_llm_responses", False),
+                                                      semantic_cache=config.get("semantic_llm_cache", False))
+            if isinstance(llm_client, SemanticCachingLLMClient):
+                llm_client = llm_client.scoped(self.llm_cache_scope(project_analysis, config))
+            config = {key: value for key, value in config.items() if key not in UNCHECKPOINTED_CONFIG_KEYS}
+            
+            # Serve repeated (or near-duplicate) submissions without calling the LLM.
+            # Articles are cached per model, and never for the mock client's canned output
+            use_article_cache = not isinstance(llm_client, MockLLMClient)
+            model = llm_client.get_model_name()
+            cached_article = await self.article_cache.aget(project_analysis, config, model) if use_article_cache else None
+            if cached_article is not None:
+                cached_state = self.create_workflow_state(project_analysis, config)
+                cached_state["final_article"] = cached_article
+                yield {"event": "complete", "result": {
+                    "success": True,
+                    "article": cached_article,
+                    "workflow_state": cached_state,
+                    "cached": True
+                }}
+                return
             
             # Get the LangGraph workflow
-            workflow = self._get_workflow(llm_client)
+            workflow = self._get_workflow()
             
             # Create initial state
             initial_state = self.create_workflow_state(project_analysis, config)
             
-            # Run the workflow with thread_id for checkpointing
+            # Checkpoints are scoped to the caller's thread (one per Streamlit session);
+            # the LLM client rides along so the compiled graph stays provider-independent
+            run_config = {"configurable": {
+                "thread_id": thread_id,
+                "llm_client": llm_client
+            }}
+            
+            # If the previous run on this thread stopped part-way with the same inputs,
+            # resume from its last checkpoint instead of redoing the completed nodes
+            run_input = initial_state
+            snapshot = await workflow.aget_state(run_config)
+            if (snapshot.next
+                    and snapshot.values.get("project_analysis") == project_analysis
+                    and snapshot.values.get("config") == config):
+                logger.info(f"Resuming workflow from checkpoint before {snapshot.next}")
+                run_input = None
+            
+            # Run the workflow, forwarding the events published by the planner and
+            # content generator and keeping the latest full state
             logger.info("Executing LangGraph workflow")
-            result = workflow.invoke(initial_state, {"configurable": {"thread_id": "test-thread"}})
+            result = initial_state
+            async for mode, chunk in workflow.astream(
+                run_input,
+                run_config,
+                stream_mode=["values", "custom"]
+            ):
+                if mode == "custom":
+                    yield chunk
+                else:
+                    result = chunk
+            
+            # The run reached the end, so there is nothing left to resume
+            self.release_thread(workflow, thread_id, interrupted=False)
             
             # Check for errors
             if result.get("error"):
                 logger.error(f"Workflow failed: {result['error']}")
-                return {
+                yield {"event": "complete", "result": {
                     "success": False,
                     "error": result["error"],
                     "article": "# Error Generating Article\n\nAn error occurred during article generation. Please try again."
-                }
+                }}
+                return
             
             # Extract the final article
-            final_article = result.get("final_article", "# Error: No article generated")
+            final_article = result.get("final_article") or "# Error: No article generated"
             
             logger.info("LangGraph workflow completed successfully")
             
-            return {
+            # Articles built from the fallback plan or error placeholders are not worth serving again
+            if use_article_cache and not is_degraded_article(result):
+                await self.article_cache.aset(project_analysis, config, final_article, model)
+            
+            yield {"event": "complete", "result": {
                 "success": True,
                 "article": final_article,
                 "workflow_state": result
-            }
+            }}
             
         except Exception as e:
             logger.error(f"LangGraph workflow execution failed: {e}")
-            return {
+            if workflow is not None:
+                self.release_thread(workflow, thread_id, interrupted=True)
+            yield {"event": "complete", "result": {
                 "success": False,
                 "error": str(e),
                 "article": "# Error Generating Article\n\nAn error occurred during article generation. Please try again."
-            }
+            }}
     
     def get_workflow_status(self, state: WorkflowState) -> Dict:
         """Get the current status of the workflow."""
         return {
-            "pre_processing_complete": state.get("extracted_content") is not None,
+            # extracted_content is released once the sections are generated
+            "pre_processing_complete": (state.get("extracted_content") is not None
+                                        or state.get("generated_sections") is not None),
             "planning_complete": state.get("article_plan") is not None,
             "content_generation_complete": state.get("generated_sections") is not None,
             "post_processing_complete": state.get("final_article") is not None,
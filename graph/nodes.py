@@ -8,18 +8,33 @@ This module implements the nodes described in FR-3 using the actual LangGraph fr
 - Post-processor node (assemble markdown & add code snippets with explanations)
 """
 
+import io
+import os
+import re
 import json
+import string
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, TypedDict, Annotated
+from collections import Counter
+from typing import Dict, List, Any, Callable, Optional, TypedDict, Annotated, Union
 from pathlib import Path
 
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import StreamWriter
+from langchain_core.runnables import RunnableConfig
+import orjson
+
+from services.llm_factory import with_context
+from services.parser import CODE_EXCERPT_CHARS
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Prompt templates directory (repo root / prompts)
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
 
 # Define the state schema for our workflow
 class WorkflowState(TypedDict):
@@ -33,6 +48,133 @@ class WorkflowState(TypedDict):
     error: Optional[str]
 
 
+def _dumps_indented(value: Any) -> str:
+    """Serialize a value as 2-space indented JSON text for the prompts."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+
+def _captured_contents(files: List[Dict], file_contents: Optional[Dict[str, str]]) -> List[Union[str, Exception]]:
+    """
+    Look up the text the parser captured for each file (project_analysis["file_contents"]).
+    
+    The extracted archive is gone by the time the workflow runs, so files the parser
+    could not capture come back as FileNotFoundError, like a file missing on disk.
+    """
+    captured = file_contents or {}
+    return [captured[f["path"]] if f["path"] in captured else FileNotFoundError(f["path"]) for f in files]
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    """
+    Compile a str.format template into a function taking its fields as keywords.
+    
+    f-strings share str.format's placeholder and brace-escaping syntax, so the template
+    becomes the body of one generated f-string; rendering then skips str.format's
+    placeholder parsing. Only used for the trusted templates in PROMPTS_DIR.
+    Like str.format, extra keyword arguments are ignored.
+    """
+    names = sorted({
+        field_name.split(".")[0].split("[")[0]
+        for _, field_name, _, _ in string.Formatter().parse(template)
+        if field_name
+    })
+    invalid = [name for name in names if not name.isidentifier()]
+    if invalid:
+        raise ValueError(f"Template fields must be names, got {invalid}")
+    
+    params = ", ".join((["*", *names] if names else []) + ["**_unused"])
+    source = f"def render({params}):\n    return f{template!r}\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<prompt template>", "exec"), namespace)
+    return namespace["render"]
+
+
+class BatchResponseError(ValueError):
+    """The single-request section response is not in the requested JSON format."""
+
+
+class PlanSectionScanner:
+    """
+    Incrementally pick completed section objects out of a streaming planner response.
+    
+    The plan's tone and audience notes follow the sections in the JSON, so content
+    generation still waits for the whole plan; this only lets progress be reported
+    while the planner is still writing.
+    """
+    
+    SECTIONS_START = re.compile(r'"sections"\s*:\s*\[')
+    
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.pending = ""  # received text not yet consumed by a parsed section
+        self.started = False
+        self.done = False
+    
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Scan the next piece of the response.
+        
+        Only the unparsed tail is kept and rescanned, so the cost per chunk is
+        bounded by the size of the section still being written rather than by
+        the whole response.
+        
+        Args:
+            chunk: The text received since the previous call
+            
+        Returns:
+            Section objects that completed with this chunk
+        """
+        sections = []
+        if self.done:
+            return sections
+        
+        self.pending += chunk
+        if not self.started:
+            match = self.SECTIONS_START.search(self.pending)
+            if match is None:
+                return sections
+            self.pending = self.pending[match.end():]
+            self.started = True
+        
+        position = 0
+        while True:
+            # Skip the separator before the next element
+            index = position
+            while index < len(self.pending) and self.pending[index] in " \t\r\n,":
+                index += 1
+            if index >= len(self.pending):
+                break
+            if self.pending[index] == "]":
+                self.done = True
+                break
+            try:
+                section, end = self.decoder.raw_decode(self.pending, index)
+            except json.JSONDecodeError:
+                break  # element not complete yet
+            if isinstance(section, dict):
+                sections.append(section)
+            position = end
+        
+        self.pending = "" if self.done else self.pending[position:]
+        return sections
+
+
+def resolve_llm_client(config: Optional[RunnableConfig], default=None):
+    """
+    Get the LLM client for a run.
+    
+    The compiled graph is shared across providers, so the client travels in the run's
+    config as configurable["llm_client"]; nodes built with their own client fall back to it.
+    """
+    if config:
+        llm_client = config.get("configurable", {}).get("llm_client")
+        if llm_client is not None:
+            return llm_client
+    if default is None:
+        raise ValueError("No LLM client configured; pass configurable['llm_client'] when invoking the graph")
+    return default
+
+
 class PreProcessingNode:
     """
     Node 1: Pre-processing → code & metadata extractor.
@@ -59,67 +201,81 @@ class PreProcessingNode:
     def __init__(self):
         self.name = "pre_processor"
     
-    # 1. Extract content from README files
-    def extract_readme_content(self, file_tree: Dict) -> str:
-        """Extract content from README files."""
-        readme_content = ""
+    # Per-file formatters, shared by the extractors and the single pass in __call__.
+    # Each takes a file's metadata and its _captured_contents result, and returns
+    # None for files that should be left out.
+    def format_readme(self, readme_file: Dict, content: Union[str, Exception]) -> Optional[str]:
+        """Format one README file for the prompt."""
+        if isinstance(content, FileNotFoundError):
+            return None
+        if isinstance(content, Exception):
+            logger.warning(f"Failed to read README file {readme_file['path']}: {content}")
+            return None
+        return f"\n## {readme_file['path']}\n{content}\n"
+    
+    def format_config(self, config_file: Dict, content: Union[str, Exception]) -> Optional[str]:
+        """Format one configuration file for the prompt."""
+        if isinstance(content, FileNotFoundError):
+            return None
+        if isinstance(content, Exception):
+            logger.warning(f"Failed to read config file {config_file['path']}: {content}")
+            return None
+        return f"\n## {config_file['path']}\n```\n{content}\n```\n"
+    
+    def summarize_code_file(self, code_file: Dict, content: Union[str, Exception]) -> Optional[Dict]:
+        """Summarize one code file, with its (truncated) content, for detailed analysis."""
+        if isinstance(content, FileNotFoundError):
+            return None
         
-        for readme_file in file_tree.get("readme_files", []):
-            try:
-                file_path = Path(readme_file["full_path"])
-                if file_path.exists():
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    readme_content += f"\n## {readme_file['path']}\n{content}\n"
-            except Exception as e:
-                logger.warning(f"Failed to read README file {readme_file['path']}: {e}")
+        file_info = {
+            "path": code_file["path"],
+            "name": code_file["name"],
+            "size": code_file["size"]
+        }
+        
+        if isinstance(content, Exception):
+            logger.warning(f"Failed to read code file {code_file['path']}: {content}")
+            file_info["content"] = "# Error reading file content"
+        else:
+            # Limit content to the first CODE_EXCERPT_CHARS characters to avoid token limits.
+            # The file was read with CODE_EXCERPT_READ_BYTES, so content is already bounded.
+            truncated = len(content) > CODE_EXCERPT_CHARS
+            file_info["content"] = content[:CODE_EXCERPT_CHARS] + "..." if truncated else content
+            file_info["full_content"] = truncated
         
-        return readme_content.strip()
+        return file_info
+    
+    # 1. Extract content from README files
+    def extract_readme_content(self, file_tree: Dict, file_contents: Optional[Dict[str, str]] = None) -> str:
+        """Extract content from README files."""
+        readme_files = file_tree.get("readme_files", [])
+        contents = _captured_contents(readme_files, file_contents)
+        chunks = [chunk for chunk in map(self.format_readme, readme_files, contents) if chunk is not None]
+        return "".join(chunks).strip()
     
-    def extract_config_content(self, file_tree: Dict) -> str:
+    def extract_config_content(self, file_tree: Dict, file_contents: Optional[Dict[str, str]] = None) -> str:
         """Extract content from configuration files."""
-        config_content = ""
-        
-        for config_file in file_tree.get("config_files", []):
-            try:
-                file_path = Path(config_file["full_path"])
-                if file_path.exists():
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    config_content += f"\n## {config_file['path']}\n```\n{content}\n```\n"
-            except Exception as e:
-                logger.warning(f"Failed to read config file {config_file['path']}: {e}")
-        
-        return config_content.strip()
+        config_files = file_tree.get("config_files", [])
+        contents = _captured_contents(config_files, file_contents)
+        chunks = [chunk for chunk in map(self.format_config, config_files, contents) if chunk is not None]
+        return "".join(chunks).strip()
     
-    def extract_code_summaries(self, file_tree: Dict, depth: str = "overview") -> str:
+    def extract_code_summaries(self, file_tree: Dict, depth: str = "overview",
+                               file_contents: Optional[Dict[str, str]] = None) -> str:
         """Extract summaries of code files based on analysis depth."""
-        code_summaries = []
+        code_files = file_tree.get("code_files", [])
         
-        for code_file in file_tree.get("code_files", []):
-            try:
-                file_path = Path(code_file["full_path"])
-                if file_path.exists():
-                    file_info = {
-                        "path": code_file["path"],
-                        "name": code_file["name"],
-                        "size": code_file["size"]
-                    }
-                    
-                    # For detailed depth, include code content
-                    if depth == "detailed":
-                        try:
-                            content = file_path.read_text(encoding='utf-8', errors='ignore')
-                            # Limit content to first 2000 characters to avoid token limits
-                            file_info["content"] = content[:2000] + ("..." if len(content) > 2000 else "")
-                            file_info["full_content"] = len(content) > 2000
-                        except Exception as e:
-                            logger.warning(f"Failed to read code file {code_file['path']}: {e}")
-                            file_info["content"] = "# Error reading file content"
-                    
-                    code_summaries.append(file_info)
-            except Exception as e:
-                logger.warning(f"Failed to process code file {code_file['path']}: {e}")
-        
-        return json.dumps(code_summaries, indent=2)
+        # Overview only lists file metadata, which the parser already recorded;
+        # no file is touched
+        if depth != "detailed":
+            return _dumps_indented([
+                {"path": f["path"], "name": f.get("name", Path(f["path"]).name), "size": f.get("size", 0)}
+                for f in code_files
+            ])
+        
+        contents = _captured_contents(code_files, file_contents)
+        summaries = [summary for summary in map(self.summarize_code_file, code_files, contents) if summary is not None]
+        return _dumps_indented(summaries)
     
     def __call__(self, state: WorkflowState) -> WorkflowState:
         """Run the pre-processing node."""
@@ -128,30 +284,52 @@ class PreProcessingNode:
         try:
             file_tree = state["project_analysis"]["file_tree"]
             
-            # Extract content from different file types
-            readme_content = self.extract_readme_content(file_tree)
-            config_content = self.extract_config_content(file_tree)
             depth = state["project_analysis"]["analysis_depth"]
-            code_files_info = self.extract_code_summaries(file_tree, depth)
             
-            # Create project structure summary
+            # Single pass over every file the prompts quote: the parser's captured text
+            # for each goes to its kind's formatter and output list
+            readme_files = file_tree.get("readme_files", ())
+            config_files = file_tree.get("config_files", ())
+            code_files = file_tree.get("code_files", ()) if depth == "detailed" else ()
+            readme_chunks, config_chunks, code_summaries = [], [], []
+            
+            files = [*readme_files, *config_files, *code_files]
+            handlers = ([(self.format_readme, readme_chunks.append)] * len(readme_files)
+                        + [(self.format_config, config_chunks.append)] * len(config_files)
+                        + [(self.summarize_code_file, code_summaries.append)] * len(code_files))
+            contents = _captured_contents(files, state["project_analysis"].get("file_contents"))
+            
+            files_extracted = 0
+            for (format_entry, append), file_info, content in zip(handlers, files, contents):
+                formatted = format_entry(file_info, content)
+                if formatted is not None:
+                    append(formatted)
+                if not isinstance(content, Exception):
+                    files_extracted += 1
+            
+            readme_content = "".join(readme_chunks).strip()
+            config_content = "".join(config_chunks).strip()
+            if depth == "detailed":
+                code_files_info = _dumps_indented(code_summaries)
+            else:
+                code_files_info = self.extract_code_summaries(file_tree, depth)
+                # Overview lists the code files from the parser's metadata without reading them
+                files_extracted += len(file_tree.get("code_files", ()))
+            
+            # Create project structure summary, counting files by extension
             project_structure = {
-                "total_files": len(file_tree["files"]),
+                "total_files": len(file_tree["files"]["path"]),
                 "directories": [d["path"] for d in file_tree["directories"]],
-                "file_types": {}
+                "file_types": dict(Counter(os.path.splitext(name)[1] for name in file_tree["files"]["name"]))
             }
             
-            # Count file types
-            for file_info in file_tree["files"]:
-                ext = Path(file_info["name"]).suffix
-                project_structure["file_types"][ext] = project_structure["file_types"].get(ext, 0) + 1
-            
             # Update state with extracted content
             state["extracted_content"] = {
                 "readme_content": readme_content,
                 "config_content": config_content,
                 "code_files_info": code_files_info,
-                "project_structure": json.dumps(project_structure, indent=2)
+                "project_structure": _dumps_indented(project_structure),
+                "files_extracted": files_extracted
             }
             
             logger.info("Pre-processing node completed")
@@ -176,21 +354,27 @@ class SectionPlannerNode:
     - The node has a method to store the generated plan in the state
     """
     
-    def __init__(self, llm_client):
+    def __init__(self, llm_client=None):
         self.name = "section_planner"
         self.llm_client = llm_client
+        self.instructions = self.load_planner_instructions()  # read once, reused for every run
+        self.prompt_template = self.load_planner_prompt()
+        self.render_prompt = compile_template(self.prompt_template)
     
     # 1. Load the planner prompt
+    def load_planner_instructions(self) -> str:
+        """Load the planner instructions, which are the same for every project."""
+        prompt_path = PROMPTS_DIR / "planner_instructions_prompt.txt"
+        return prompt_path.read_text(encoding='utf-8')
+    
     def load_planner_prompt(self) -> str:
         """Load the planner prompt template."""
-        prompt_path = Path(__file__).parent.parent / "prompts" / "planner_prompt.txt"
+        prompt_path = PROMPTS_DIR / "planner_prompt.txt"
         return prompt_path.read_text(encoding='utf-8')
     
     # 2. Format the planner prompt with project data
     def format_planner_prompt(self, state: WorkflowState) -> str:
         """Format the planner prompt with project data."""
-        prompt_template = self.load_planner_prompt()
-        
         analysis = state["project_analysis"]
         config = state["config"]
         
@@ -199,7 +383,7 @@ class SectionPlannerNode:
         config_files_list = [f["path"] for f in analysis["file_tree"]["config_files"]]
         code_files_list = [f["path"] for f in analysis["file_tree"]["code_files"]]
         
-        return prompt_template.format(
+        return self.render_prompt(
             project_name=config.get("article_title", "Project"),
             analysis_depth=config["analysis_depth"],
             article_tone=config["article_tone"],
@@ -247,26 +431,42 @@ class SectionPlannerNode:
                 }
             ],
             "tone_notes": f"Use {config['article_tone'].lower()} tone",
-            "audience_notes": f"Target {config['target_audience'].lower()} developers"
+            "audience_notes": f"Target {config['target_audience'].lower()} developers",
+            "fallback": True
         }
     
-    def __call__(self, state: WorkflowState) -> WorkflowState:
+    async def __call__(self, state: WorkflowState, config: RunnableConfig = None,
+                       writer: StreamWriter = None) -> WorkflowState:
         """Run the section planner node."""
         logger.info("Starting section planner node")
         
         try:
+            llm_client = resolve_llm_client(config, self.llm_client)
+            
             # Format the prompt
             prompt = self.format_planner_prompt(state)
             
-            # Get response from LLM
-            response = self.llm_client.generate_content(prompt)
+            # Stream the response from the LLM, publishing each planned section
+            # as soon as its JSON object is complete. The static instructions go
+            # first, ahead of the project data, so providers can serve them from
+            # their prompt cache: caching only applies to an identical prefix.
+            buffer = io.StringIO()
+            scanner = PlanSectionScanner()
+            planned = 0
+            async for chunk in llm_client.astream_content(prompt, context=self.instructions):
+                buffer.write(chunk)
+                if writer is None:
+                    continue
+                for section in scanner.feed(chunk):
+                    writer({"event": "plan_section", "index": planned, "heading": section.get("heading", "")})
+                    planned += 1
             
             # Parse the JSON response
             try:
-                plan = json.loads(response.text)
+                plan = orjson.loads(buffer.getvalue())
                 state["article_plan"] = plan
                 logger.info(f"Generated plan with {len(plan.get('sections', []))} sections")
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Failed to parse LLM response as JSON: {e}")
                 # Fallback to a basic plan
                 state["article_plan"] = self.create_fallback_plan(state)
@@ -279,31 +479,159 @@ class SectionPlannerNode:
 
 
 class ContentGeneratorNode:
-    """Node 3: Content Generator → LLM writes each section (stream output)."""
+    """
+    Node 3: Content Generator → LLM writes each section (stream output).
+    
+    Each section is generated by its own concurrent call, streamed when the client can
+    stream and sent through its batch API when it can't. With batch_sections (opt-in),
+    a non-streaming client is first asked for every section in a single call, so the
+    shared project context is sent once, provided the plan's estimated output is small
+    enough; an unusable response falls back to the per-section calls.
+    """
     
-    def __init__(self, llm_client):
+    # Body of a section whose generation failed
+    SECTION_ERROR_NOTE = "*Content generation for this section encountered an error. Please review the project files manually.*"
+    
+    # Rough output size per planned section length, in tokens
+    SECTION_TOKEN_ESTIMATES = {"short": 300, "medium": 600, "long": 1000}
+    
+    # Output token cap configured on the LLM clients (max_tokens in LLMFactory)
+    BATCH_OUTPUT_TOKEN_LIMIT = 4000
+    
+    # Largest estimated output sent as a single request: half the cap, since the
+    # estimates are rough and a truncated response means generating everything twice
+    BATCH_OUTPUT_TOKEN_BUDGET = BATCH_OUTPUT_TOKEN_LIMIT // 2
+    
+    # Default cap on concurrent per-section requests, to stay within provider rate limits
+    MAX_CONCURRENT_SECTIONS = 8
+    
+    def __init__(self, llm_client=None, batch_sections: bool = False,
+                 max_concurrency: int = MAX_CONCURRENT_SECTIONS):
         self.name = "content_generator"
         self.llm_client = llm_client
+        self.batch_sections = batch_sections
+        self.max_concurrency = max_concurrency
+        
+        # Prompt templates are read once, not once per section
+        self.section_context_template = self.load_section_context_prompt()
+        self.section_prompt_template = self.load_section_prompt()
+        self.batch_prompt_template = self.load_batch_prompt()
+        
+        # ...and compiled to render functions, since sections are formatted repeatedly
+        self.render_section_context = compile_template(self.section_context_template)
+        self.render_section = compile_template(self.section_prompt_template)
+        self.render_batch = compile_template(self.batch_prompt_template)
+    
+    def load_section_context_prompt(self) -> str:
+        """Load the template for the context shared by every section prompt."""
+        prompt_path = PROMPTS_DIR / "section_context_prompt.txt"
+        return prompt_path.read_text(encoding='utf-8')
     
     def load_section_prompt(self) -> str:
-        """Load the section prompt template."""
-        prompt_path = Path(__file__).parent.parent / "prompts" / "section_prompt.txt"
+        """Load the section-specific prompt template."""
+        prompt_path = PROMPTS_DIR / "section_prompt.txt"
         return prompt_path.read_text(encoding='utf-8')
     
-    def format_section_prompt(self, section: Dict, state: WorkflowState) -> str:
-        """Format the section prompt with section data."""
-        prompt_template = self.load_section_prompt()
+    def load_batch_prompt(self) -> str:
+        """Load the prompt template that requests every section in one response."""
+        prompt_path = PROMPTS_DIR / "batch_section_prompt.txt"
+        return prompt_path.read_text(encoding='utf-8')
+    
+    def format_batch_prompt(self, state: WorkflowState) -> str:
+        """Format the batch prompt with the whole plan and the shared project data."""
+        config = state["config"]
+        plan = state["article_plan"]
+        extracted_content = state["extracted_content"]
+        
+        sections_list = "\n".join(
+            f"{i+1}. {section['heading']} ({section['content_type']}): {', '.join(section['key_points'])}"
+            for i, section in enumerate(plan["sections"])
+        )
+        
+        return self.render_batch(
+            article_tone=config["article_tone"],
+            target_audience=config["target_audience"],
+            project_name=config.get("article_title", "Project"),
+            tone_notes=plan["tone_notes"],
+            audience_notes=plan["audience_notes"],
+            readme_content=extracted_content["readme_content"],
+            config_content=extracted_content["config_content"],
+            code_files_info=extracted_content["code_files_info"],
+            project_structure=extracted_content["project_structure"],
+            sections_list=sections_list,
+            section_count=len(plan["sections"])
+        )
+    
+    def fits_in_one_response(self, plan: Dict) -> bool:
+        """Check whether the plan's estimated output fits the single-request budget."""
+        estimated_tokens = sum(
+            self.SECTION_TOKEN_ESTIMATES.get(section.get("estimated_length"), self.SECTION_TOKEN_ESTIMATES["long"])
+            for section in plan["sections"]
+        )
+        return estimated_tokens <= self.BATCH_OUTPUT_TOKEN_BUDGET
+    
+    def parse_batch_response(self, text: str, count: int) -> List[str]:
+        """
+        Extract the section bodies from a single-request response.
+        
+        Raises:
+            BatchResponseError: If the response doesn't hold a JSON object with
+                exactly count section bodies
+        """
+        # Tolerate prose or code fences around the JSON object
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end < start:
+            raise BatchResponseError("response contains no JSON object")
+        try:
+            payload = orjson.loads(text[start:end + 1])
+        except orjson.JSONDecodeError as e:
+            raise BatchResponseError(f"response JSON is invalid: {e}") from e
+        
+        bodies = payload.get("sections") if isinstance(payload, dict) else None
+        if not isinstance(bodies, list):
+            raise BatchResponseError("response JSON has no 'sections' list")
+        if len(bodies) != count or not all(isinstance(body, str) for body in bodies):
+            raise BatchResponseError(f"expected {count} section bodies, got {len(bodies)}")
+        return bodies
+    
+    async def generate_all_sections(self, state: WorkflowState, llm_client) -> Optional[List[str]]:
+        """
+        Generate every section with a single LLM call.
+        
+        Returns:
+            The formatted sections in plan order, or None if the response was unusable
+        """
+        sections = state["article_plan"]["sections"]
+        
+        try:
+            response = await llm_client.agenerate_content(self.format_batch_prompt(state))
+            bodies = self.parse_batch_response(response.text, len(sections))
+            
+        except BatchResponseError as e:
+            # The client answered, just not in the batch format; expected for clients
+            # that don't support it, so not worth a warning
+            logger.debug(f"Single-request section response unusable, generating per section: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Single-request section generation failed, generating per section: {e}")
+            return None
+        
+        return [f"## {section['heading']}\n\n{body}\n\n" for section, body in zip(sections, bodies)]
+    
+    def format_section_context(self, state: WorkflowState) -> str:
+        """
+        Format the context shared by every section: instructions and project data.
         
+        It is sent ahead of each section prompt as a separate context block, which
+        clients with prompt caching upload once and reuse for the other sections.
+        """
         config = state["config"]
         extracted_content = state["extracted_content"]
         
-        return prompt_template.format(
+        return self.render_section_context(
             article_tone=config["article_tone"],
             target_audience=config["target_audience"],
             project_name=config.get("article_title", "Project"),
-            section_heading=section["heading"],
-            content_type=section["content_type"],
-            key_points=", ".join(section["key_points"]),
             tone_notes=state["article_plan"]["tone_notes"],
             audience_notes=state["article_plan"]["audience_notes"],
             readme_content=extracted_content["readme_content"],
@@ -312,37 +640,130 @@ class ContentGeneratorNode:
             project_structure=extracted_content["project_structure"]
         )
     
-    def __call__(self, state: WorkflowState) -> WorkflowState:
+    def format_section_prompt(self, section: Dict) -> str:
+        """Format the section-specific part of the prompt."""
+        return self.render_section(
+            section_heading=section["heading"],
+            content_type=section["content_type"],
+            key_points=", ".join(section["key_points"])
+        )
+    
+    async def generate_section(self, index: int, section: Dict, state: WorkflowState, llm_client,
+                               writer: StreamWriter = None, context: Optional[str] = None) -> str:
+        """
+        Generate the markdown for a single section, falling back to a placeholder on error.
+        
+        Args:
+            context: Result of format_section_context(state), formatted here if not given
+        """
+        total = len(state["article_plan"]["sections"])
+        logger.info(f"Generating content for section {index+1}/{total}: {section['heading']}")
+        
+        try:
+            if context is None:
+                context = self.format_section_context(state)
+            prompt = self.format_section_prompt(section)
+            
+            # Write the response into the section as it streams in, forwarding each
+            # chunk so the UI can show the section before it is finished
+            buffer = io.StringIO()
+            heading = f"## {section['heading']}\n\n"
+            buffer.write(heading)
+            if writer is not None:
+                writer({"event": "section_chunk", "index": index, "text": heading})
+            async for chunk in llm_client.astream_content(prompt, context=context):
+                buffer.write(chunk)
+                if writer is not None:
+                    writer({"event": "section_chunk", "index": index, "text": chunk})
+            buffer.write("\n\n")
+            section_content = buffer.getvalue()
+            
+        except Exception as e:
+            logger.error(f"Failed to generate content for section '{section['heading']}': {e}")
+            # Add fallback content
+            section_content = f"## {section['heading']}\n\n{self.SECTION_ERROR_NOTE}\n\n"
+        
+        # Publish the section as soon as it is ready when running under a streaming graph
+        if writer is not None:
+            writer({"event": "section", "index": index, "total": total, "content": section_content})
+        
+        return section_content
+    
+    async def generate_sections_batch(self, state: WorkflowState, llm_client,
+                                      writer: StreamWriter = None, context: Optional[str] = None) -> List[str]:
+        """
+        Generate every section prompt through the client's batch API, for clients that
+        cannot stream (streaming them would only deliver each section once it is done).
+        
+        Args:
+            context: Result of format_section_context(state), formatted here if not given
+        """
+        sections = state["article_plan"]["sections"]
+        logger.info(f"Generating content for {len(sections)} sections as one batch")
+        
+        if context is None:
+            context = self.format_section_context(state)
+        prompts = [with_context(self.format_section_prompt(section), context) for section in sections]
+        
+        try:
+            responses = await llm_client.agenerate_batch(prompts)
+            sections_content = [f"## {section['heading']}\n\n{response.text}\n\n"
+                                for section, response in zip(sections, responses)]
+        except Exception as e:
+            logger.error(f"Failed to generate content for the section batch: {e}")
+            sections_content = [f"## {section['heading']}\n\n{self.SECTION_ERROR_NOTE}\n\n" for section in sections]
+        
+        if writer is not None:
+            for i, section_content in enumerate(sections_content):
+                writer({"event": "section", "index": i, "total": len(sections_content), "content": section_content})
+        
+        return sections_content
+    
+    async def __call__(self, state: WorkflowState, config: RunnableConfig = None,
+                       writer: StreamWriter = None) -> WorkflowState:
         """Run the content generator node."""
         logger.info("Starting content generator node")
         
         try:
-            sections_content = []
+            llm_client = resolve_llm_client(config, self.llm_client)
             plan = state["article_plan"]
             
-            # Loop through each section in the plan
-            for i, section in enumerate(plan["sections"]):
-                logger.info(f"Generating content for section {i+1}/{len(plan['sections'])}: {section['heading']}")
+            sections_content = None
+            # Streaming clients always take the concurrent per-section path, which
+            # previews each section as it is written
+            if self.batch_sections and not llm_client.supports_streaming and self.fits_in_one_response(plan):
+                sections_content = await self.generate_all_sections(state, llm_client)
+                if sections_content is not None and writer is not None:
+                    for i, section_content in enumerate(sections_content):
+                        writer({"event": "section", "index": i, "total": len(sections_content),
+                                "content": section_content})
+            
+            if sections_content is None and not llm_client.supports_streaming:
+                sections_content = await self.generate_sections_batch(
+                    state, llm_client, writer, self.format_section_context(state))
+            
+            if sections_content is None:
+                # Sections are independent, so issue the LLM requests concurrently,
+                # at most max_concurrency at a time. gather() preserves the plan order.
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                context = self.format_section_context(state)
                 
-                try:
-                    # Generate content for this section
-                    prompt = self.format_section_prompt(section, state)
-                    response = self.llm_client.generate_content(prompt)
-                    
-                    # Format the response
-                    section_content = f"## {section['heading']}\n\n{response.text}\n\n"
-                    sections_content.append(section_content)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to generate content for section '{section['heading']}': {e}")
-                    # Add fallback content
-                    fallback_content = f"## {section['heading']}\n\n*Content generation for this section encountered an error. Please review the project files manually.*\n\n"
-                    sections_content.append(fallback_content)
+                async def generate_bounded(i: int, section: Dict) -> str:
+                    async with semaphore:
+                        return await self.generate_section(i, section, state, llm_client, writer, context)
+                
+                sections_content = await asyncio.gather(
+                    *(generate_bounded(i, section) for i, section in enumerate(plan["sections"]))
+                )
             
             # Store generated content
-            state["generated_sections"] = sections_content
+            state["generated_sections"] = list(sections_content)
             logger.info(f"Generated content for {len(sections_content)} sections")
             
+            # The extracted project content is only needed for prompting; dropping it
+            # keeps the remaining checkpoints (and the returned state) small
+            state["extracted_content"] = None
+            
         except Exception as e:
             logger.error(f"Content generation failed: {e}")
             state["error"] = f"Content generation failed: {str(e)}"
@@ -353,25 +774,26 @@ class ContentGeneratorNode:
 class PostProcessorNode:
     """Node 4: Post-processor → assemble markdown & add code snippets with explanations."""
     
+    # Body used when content generation was skipped because the project had nothing to describe
+    NO_CONTENT_SECTION = (
+        "*No README, configuration or code content could be extracted from this project, "
+        "so no sections were generated. Please check the uploaded archive and try again.*\n\n"
+    )
+    
     def __init__(self):
         self.name = "post_processor"
     
     def assemble_article(self, state: WorkflowState) -> str:
         """Assemble the final article from generated sections."""
         plan = state["article_plan"]
-        sections_content = state["generated_sections"]
-        
-        # Start with title
-        article = f"# {plan['title']}\n\n"
-        
-        # Add sections
-        for section_content in sections_content:
-            article += section_content
+        sections_content = state["generated_sections"] or [self.NO_CONTENT_SECTION]
         
-        # Add metadata footer
-        article += self.add_metadata_footer(state)
-        
-        return article
+        # Title, sections and metadata footer, joined in a single allocation
+        return "".join([
+            f"# {plan['title']}\n\n",
+            *sections_content,
+            self.add_metadata_footer(state)
+        ])
     
     def add_metadata_footer(self, state: WorkflowState) -> str:
         """Add metadata footer to the article."""
@@ -416,16 +838,52 @@ class PostProcessorNode:
         return state
 
 
-def create_workflow_graph(llm_client) -> StateGraph:
-    """Create the LangGraph workflow."""
+def is_degraded_article(state: WorkflowState) -> bool:
+    """
+    Whether a finished run's article was assembled from stand-ins rather than LLM output.
+    
+    That is the case when the planner fell back to the generic plan, content generation
+    was skipped, or any section holds the error placeholder.
+    """
+    plan = state.get("article_plan") or {}
+    sections = state.get("generated_sections")
+    return (
+        bool(plan.get("fallback"))
+        or sections is None
+        or any(ContentGeneratorNode.SECTION_ERROR_NOTE in section for section in sections)
+    )
+
+
+def route_after_planning(state: WorkflowState) -> str:
+    """
+    Choose the node after the section planner.
+    
+    Content generation (one LLM call per section) is skipped when the project gave the
+    writer nothing to work from: no file could be extracted, whether the project is
+    empty or every read failed.
+    """
+    if (state.get("extracted_content") or {}).get("files_extracted"):
+        return "content_generator"
+    
+    logger.warning("No project content extracted, skipping content generation")
+    return "post_processor"
+
+
+def create_workflow_graph() -> StateGraph:
+    """
+    Create the LangGraph workflow.
+    
+    The graph is provider-independent: pass the LLM client per run as
+    config["configurable"]["llm_client"] so one compiled graph serves every provider.
+    """
     
     # Create the state graph
     workflow = StateGraph(WorkflowState)
     
     # Add nodes
     pre_processor = PreProcessingNode()
-    section_planner = SectionPlannerNode(llm_client)
-    content_generator = ContentGeneratorNode(llm_client)
+    section_planner = SectionPlannerNode()
+    content_generator = ContentGeneratorNode()
     post_processor = PostProcessorNode()
     
     workflow.add_node("pre_processor", pre_processor)
@@ -436,7 +894,11 @@ def create_workflow_graph(llm_client) -> StateGraph:
     # Define the workflow edges
     workflow.set_entry_point("pre_processor")
     workflow.add_edge("pre_processor", "section_planner")
-    workflow.add_edge("section_planner", "content_generator")
+    workflow.add_conditional_edges(
+        "section_planner",
+        route_after_planning,
+        {"content_generator": "content_generator", "post_processor": "post_processor"}
+    )
     workflow.add_edge("content_generator", "post_processor")
     workflow.add_edge("post_processor", END)
     
@@ -0,0 +1,184 @@
+"""
+Article cache for the generation workflow.
+
+This module avoids re-running the LLM pipeline for projects that were already processed:
+- Exact tier: keyed by the archive's SHA-256 plus the generation settings and model,
+  persisted on disk for ARTICLE_CACHE_TTL
+- Semantic tier: cosine similarity over project embeddings for near-duplicate uploads (optional)
+
+The semantic tier requires sentence-transformers; without it only exact matches are served.
+"""
+
+import asyncio
+import logging
+import threading
+import importlib.util
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import diskcache
+
+from services.llm_factory import load_embedding_model
+
+# Optional embedding model for the semantic tier. Only probe for it here: importing
+# sentence-transformers pulls in torch, so it is deferred until the first embedding.
+SEMANTIC_CACHE_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+# How long generated articles stay in the on-disk exact tier, in seconds
+ARTICLE_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Semantic tier bounds: articles kept per settings key (oldest dropped first) and
+# settings keys kept in all (least recently used dropped first)
+SEMANTIC_ROWS_PER_SETTINGS = 256
+SEMANTIC_SETTINGS_KEYS = 64
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+if not SEMANTIC_CACHE_AVAILABLE:
+    logger.info("sentence-transformers not available, semantic article cache disabled")
+
+
+class ArticleCache:
+    """Two-tier (exact + semantic) cache of generated articles."""
+
+    def __init__(self, cache_dir: str = ".article_cache", similarity_threshold: float = 0.92,
+                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the persistent exact-match cache
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embedding_model: Sentence-transformers model used for the semantic tier
+        """
+        self.exact = diskcache.Cache(cache_dir)
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+
+        # Semantic tier, partitioned by generation settings and shared by every session:
+        # settings key -> (normalized embedding matrix, articles in row order), LRU order.
+        # Entries are replaced under the lock, never mutated, so rows and articles stay aligned.
+        self._semantic: "OrderedDict[Tuple, Tuple[Any, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def settings_key(config: Dict, model: Optional[str] = None) -> Tuple:
+        """Build the part of the cache key that depends on the user's settings and the model."""
+        return (
+            config.get("analysis_depth"),
+            config.get("article_tone"),
+            config.get("llm_provider"),
+            config.get("target_audience"),
+            config.get("article_title"),
+            model,
+        )
+
+    def exact_key(self, config: Dict, model: Optional[str] = None) -> Optional[Tuple]:
+        """Build the exact-match key, or None if the archive fingerprint is unknown."""
+        fingerprint = config.get("project_fingerprint")
+        if not fingerprint:
+            return None
+        return (fingerprint, *self.settings_key(config, model))
+
+    def project_text(self, project_analysis: Dict) -> str:
+        """Summarize a project as text for embedding: README content plus the file tree."""
+        file_tree = project_analysis["file_tree"]
+        # README text captured by the parser; the extracted files are gone by now
+        file_contents = project_analysis.get("file_contents") or {}
+        parts = [file_contents[readme_file["path"]] for readme_file in file_tree.get("readme_files", [])
+                 if readme_file["path"] in file_contents]
+
+        parts.extend(sorted(file_tree["files"]["path"]))
+        return "\n".join(parts)
+
+    def _embed(self, project_analysis: Dict) -> Optional[Any]:
+        """Embed a project, or return None if the semantic tier is unavailable."""
+        if not SEMANTIC_CACHE_AVAILABLE:
+            return None
+
+        try:
+            return load_embedding_model(self.embedding_model).encode(self.project_text(project_analysis),
+                                                                     normalize_embeddings=True)
+        except Exception as e:
+            logger.warning(f"Failed to embed project for semantic cache: {e}")
+            return None
+
+    async def aget(self, project_analysis: Dict, config: Dict, model: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a previously generated article.
+
+        The project is embedded in a worker thread, so the event loop keeps running.
+
+        Args:
+            project_analysis: Results from project parsing
+            config: User configuration (tone, depth, etc.)
+            model: Name of the model that would generate the article
+
+        Returns:
+            The cached article, or None on a miss
+        """
+        key = self.exact_key(config, model)
+        if key is not None:
+            article = self.exact.get(key)
+            if article is not None:
+                logger.info("Article cache hit (exact)")
+                return article
+
+        settings = self.settings_key(config, model)
+        with self._lock:
+            if settings not in self._semantic:
+                return None
+
+        query = await asyncio.to_thread(self._embed, project_analysis)
+        if query is None:
+            return None
+
+        with self._lock:
+            entry = self._semantic.get(settings)
+            if entry is None:
+                return None
+            self._semantic.move_to_end(settings)
+        vectors, articles = entry
+
+        # Embeddings are normalized, so a single matmul gives the cosine similarities
+        similarities = vectors @ query
+        best = int(similarities.argmax())
+        if similarities[best] >= self.similarity_threshold:
+            logger.info(f"Article cache hit (semantic, similarity {similarities[best]:.3f})")
+            return articles[best]
+
+        return None
+
+    async def aset(self, project_analysis: Dict, config: Dict, article: str, model: Optional[str] = None) -> None:
+        """
+        Store a generated article in both cache tiers.
+
+        Args:
+            project_analysis: Results from project parsing
+            config: User configuration (tone, depth, etc.)
+            article: The final article markdown
+            model: Name of the model that generated the article
+        """
+        key = self.exact_key(config, model)
+        if key is not None:
+            self.exact.set(key, article, expire=ARTICLE_CACHE_TTL)
+
+        vector = await asyncio.to_thread(self._embed, project_analysis)
+        if vector is None:
+            return
+
+        import numpy as np
+
+        settings = self.settings_key(config, model)
+        with self._lock:
+            entry = self._semantic.pop(settings, None)
+            if entry is None:
+                entry = (vector[np.newaxis, :], [article])
+            else:
+                vectors, articles = entry
+                entry = (np.vstack([vectors[-(SEMANTIC_ROWS_PER_SETTINGS - 1):], vector]),
+                         articles[-(SEMANTIC_ROWS_PER_SETTINGS - 1):] + [article])
+            self._semantic[settings] = entry
+            while len(self._semantic) > SEMANTIC_SETTINGS_KEYS:
+                self._semantic.popitem(last=False)
@@ -6,28 +6,99 @@ UI dropdown maps to provider-specific env keys (e.g., OPENAI_API_KEY).
 """
 
 import os
-import json
+import re
+import copy
+import time
+import asyncio
+import hashlib
+import contextlib
 import logging
-from typing import Optional, Dict, Any
+import threading
+import importlib.util
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple, Final
 from abc import ABC, abstractmethod
 
-# LangChain imports for real LLM integration
-try:
-    from langchain_openai import ChatOpenAI
-    from langchain_anthropic import ChatAnthropic
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-    logger.warning("LangChain packages not available. Install with: pip install langchain-openai langchain-anthropic langchain-google-genai")
+import diskcache
+import orjson
+
+# Optional embedding model for the semantic response cache. Only probe for it here:
+# importing sentence-transformers pulls in torch, so it is deferred until first use.
+SEMANTIC_CACHE_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+# LangChain provider packages are imported by each client's constructor, so that
+# importing this module (e.g. for the mock client) does not pay their import cost.
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+class RequestRateLimiter:
+    """
+    Token bucket pacing requests to a provider, shared by every event loop and thread.
+    
+    Clients are shared across the process (one per provider and API key) while each
+    asyncio.run - every Streamlit session and rerun - has its own event loop, so the
+    bucket is guarded by a thread lock rather than tied to a loop. Up to a minute's
+    worth of requests may go out at once; after that they are spaced at the refill rate.
+    """
+    
+    def __init__(self, requests_per_minute: float):
+        self.capacity = requests_per_minute
+        self.rate = requests_per_minute / 60  # tokens per second
+        self._tokens = requests_per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: each waiting request has reserved its own slot
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+    
+    async def __aenter__(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
     
+    # Default cap on concurrent requests issued by agenerate_batch
+    max_concurrency = 8
+    
+    # Whether astream_content yields the response incrementally; callers batch the
+    # requests of clients that don't (see agenerate_batch) instead of streaming them
+    supports_streaming = False
+    
+    # Client-side request rate limit, in requests per minute (None: unlimited)
+    requests_per_minute: Optional[float] = None
+    
+    def rate_limiter(self):
+        """
+        Get the async context manager that paces requests to the provider.
+        
+        Requests are throttled before they are sent, instead of being rejected by the
+        provider and retried. The limiter is created once per client, so every session
+        sharing the client draws from the same budget.
+        """
+        if self.requests_per_minute is None:
+            return contextlib.nullcontext()
+        
+        limiter = self.__dict__.get("_limiter")
+        if limiter is None:
+            limiter = self.__dict__.setdefault("_limiter", RequestRateLimiter(self.requests_per_minute))
+        return limiter
+    
     @abstractmethod
     def generate_content(self, prompt: str) -> Any:
         """Generate content from a prompt."""
@@ -37,124 +108,121 @@ class LLMClient(ABC):
     def get_model_name(self) -> str:
         """Get the model name for this client."""
         pass
-
-
-class MockLLMClient(LLMClient):
-    """Mock LLM client for testing and development."""
     
-    def __init__(self, provider_name: str = "Mock"):
-        self.provider_name = provider_name
-        logger.info(f"Initialized Mock LLM client for {provider_name}")
+    async def agenerate_content(self, prompt: str) -> Any:
+        """
+        Generate content from a prompt without blocking the event loop.
+        
+        Clients without a native async API run the sync call in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate_content, prompt)
     
-    def generate_content(self, prompt: str) -> Any:
-        """Generate mock content for testing."""
-        # Simple mock response based on prompt type
-        if "planner" in prompt.lower():
-            # Determine tone from prompt
-            tone = "conversational"
-            if "explanatory" in prompt.lower():
-                tone = "explanatory"
-            elif "marketing" in prompt.lower():
-                tone = "marketing"
-            
-            # Determine depth from prompt
-            depth = "overview"
-            if "detailed" in prompt.lower():
-                depth = "detailed"
-            
-            # Determine audience from prompt
-            audience = "intermediate"
-            if "beginner" in prompt.lower():
-                audience = "beginner"
-            elif "advanced" in prompt.lower():
-                audience = "advanced"
-            
-            # Generate appropriate plan based on parameters
-            if depth == "detailed":
-                sections = [
-                    {
-                        "heading": "Introduction",
-                        "content_type": "overview",
-                        "key_points": ["Project overview", "Main features", "What you'll learn"],
-                        "estimated_length": "short"
-                    },
-                    {
-                        "heading": "Architecture Deep Dive",
-                        "content_type": "code_analysis",
-                        "key_points": ["Code structure", "Key components", "Design patterns"],
-                        "estimated_length": "long"
-                    },
-                    {
-                        "heading": "Getting Started",
-                        "content_type": "setup",
-                        "key_points": ["Prerequisites", "Installation", "Configuration"],
-                        "estimated_length": "medium"
-                    },
-                    {
-                        "heading": "Implementation Details",
-                        "content_type": "code_analysis",
-                        "key_points": ["Core functions", "Data flow", "Error handling"],
-                        "estimated_length": "long"
-                    },
-                    {
-                        "heading": "Advanced Features",
-                        "content_type": "features",
-                        "key_points": ["Advanced functionality", "Customization options", "Performance tips"],
-                        "estimated_length": "medium"
-                    },
-                    {
-                        "heading": "Conclusion",
-                        "content_type": "conclusion",
-                        "key_points": ["Summary", "Next steps", "Resources"],
-                        "estimated_length": "short"
-                    }
-                ]
-            else:
-                sections = [
-                    {
-                        "heading": "Introduction",
-                        "content_type": "overview",
-                        "key_points": ["Project overview", "Main features", "What you'll learn"],
-                        "estimated_length": "short"
-                    },
-                    {
-                        "heading": "Getting Started",
-                        "content_type": "setup",
-                        "key_points": ["Prerequisites", "Installation", "Configuration"],
-                        "estimated_length": "medium"
-                    },
-                    {
-                        "heading": "Features and Usage",
-                        "content_type": "features",
-                        "key_points": ["Main functionality", "Key features", "Usage examples"],
-                        "estimated_length": "medium"
-                    },
-                    {
-                        "heading": "Conclusion",
-                        "content_type": "conclusion",
-                        "key_points": ["Summary", "Next steps", "Resources"],
-                        "estimated_length": "short"
-                    }
-                ]
-            
-            plan = {
-                "title": "Sample Project Article",
-                "sections": sections,
-                "tone_notes": f"Use {tone} tone",
-                "audience_notes": f"Target {audience} developers"
-            }
-            
-            return MockResponse(json.dumps(plan, indent=2))
-        else:
-            # Generate section content based on tone
-            tone = "conversational"
-            if "explanatory" in prompt.lower():
-                tone = "explanatory"
-            elif "marketing" in prompt.lower():
-                tone = "marketing"
-            
-            if tone == "explanatory":
-                content = """## Sample Section Content
+    async def agenerate_batch(self, prompts: List[str]) -> List[Any]:
+        """
+        Generate content for several independent prompts concurrently, in order.
+        
+        At most max_concurrency requests are in flight at a time.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def generate_bounded(prompt: str) -> Any:
+            async with semaphore:
+                return await self.agenerate_content(prompt)
+        
+        return await asyncio.gather(*(generate_bounded(prompt) for prompt in prompts))
+    
+    async def astream_content(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Generate content from a prompt, yielding text chunks as they arrive.
+        
+        Args:
+            prompt: The request-specific prompt
+            context: Optional context shared by several requests (e.g. project data), sent
+                ahead of the prompt; clients with prompt caching cache it across requests
+        
+        Clients without a streaming API yield the whole response as one chunk.
+        """
+        response = await self.agenerate_content(with_context(prompt, context))
+        yield response.text
+
+
+# Keywords the mock client looks for to pick a canned response
+_PROMPT_KEYWORDS_RE = re.compile(r"planner|sections to write|explanatory|marketing|detailed|beginner|advanced",
+                                 re.IGNORECASE)
+
+# Number of sections requested by the single-request (batch) section prompt
+_BATCH_SECTION_COUNT_RE = re.compile(r"content for all (\d+) sections")
+
+
+# Canned mock responses, built once rather than on every call
+MOCK_DETAILED_SECTIONS: Final = [
+    {
+        "heading": "Introduction",
+        "content_type": "overview",
+        "key_points": ["Project overview", "Main features", "What you'll learn"],
+        "estimated_length": "short"
+    },
+    {
+        "heading": "Architecture Deep Dive",
+        "content_type": "code_analysis",
+        "key_points": ["Code structure", "Key components", "Design patterns"],
+        "estimated_length": "long"
+    },
+    {
+        "heading": "Getting Started",
+        "content_type": "setup",
+        "key_points": ["Prerequisites", "Installation", "Configuration"],
+        "estimated_length": "medium"
+    },
+    {
+        "heading": "Implementation Details",
+        "content_type": "code_analysis",
+        "key_points": ["Core functions", "Data flow", "Error handling"],
+        "estimated_length": "long"
+    },
+    {
+        "heading": "Advanced Features",
+        "content_type": "features",
+        "key_points": ["Advanced functionality", "Customization options", "Performance tips"],
+        "estimated_length": "medium"
+    },
+    {
+        "heading": "Conclusion",
+        "content_type": "conclusion",
+        "key_points": ["Summary", "Next steps", "Resources"],
+        "estimated_length": "short"
+    }
+]
+
+MOCK_OVERVIEW_SECTIONS: Final = [
+    {
+        "heading": "Introduction",
+        "content_type": "overview",
+        "key_points": ["Project overview", "Main features", "What you'll learn"],
+        "estimated_length": "short"
+    },
+    {
+        "heading": "Getting Started",
+        "content_type": "setup",
+        "key_points": ["Prerequisites", "Installation", "Configuration"],
+        "estimated_length": "medium"
+    },
+    {
+        "heading": "Features and Usage",
+        "content_type": "features",
+        "key_points": ["Main functionality", "Key features", "Usage examples"],
+        "estimated_length": "medium"
+    },
+    {
+        "heading": "Conclusion",
+        "content_type": "conclusion",
+        "key_points": ["Summary", "Next steps", "Resources"],
+        "estimated_length": "short"
+    }
+]
+
+MOCK_SECTION_CONTENT: Final = {
+    "explanatory": """## Sample Section Content
 
 This section provides a comprehensive overview of the project's key components and functionality. The implementation follows established best practices and demonstrates effective software engineering principles.
 
@@ -174,10 +242,8 @@ def example_function():
     return True
 ```
 
-This example illustrates the project's coding standards and architectural patterns."""
-            
-            elif tone == "marketing":
-                content = """## Revolutionary Project Features
+This example illustrates the project's coding standards and architectural patterns.""",
+    "marketing": """## Revolutionary Project Features
 
 Discover the game-changing capabilities that make this project stand out from the competition! You won't believe how this innovative solution can transform your development workflow.
 
@@ -196,10 +262,8 @@ def amazing_function():
     return True  # Guaranteed success!
 ```
 
-This is just the beginning - wait until you see what else this project can do!"""
-            
-            else:  # conversational
-                content = """## Let's Talk About This Section
+This is just the beginning - wait until you see what else this project can do!""",
+    "conversational": """## Let's Talk About This Section
 
 Hey there! I'm excited to walk you through this part of the project. When I first started working on this, I had no idea how much fun it would be to build. Let me share what I've learned along the way.
 
@@ -218,9 +282,84 @@ def my_favorite_function():
     return True  # Works like a charm!
 ```
 
-I hope you find this as useful as I do. Let me know if you have any questions!"""
+I hope you find this as useful as I do. Let me know if you have any questions!""",
+}
+
+# Plans are pre-serialized for every (depth, tone, audience) the mock can detect
+_MOCK_PLANS: Final = {
+    (depth, tone, audience): orjson.dumps({
+        "title": "Sample Project Article",
+        "sections": MOCK_DETAILED_SECTIONS if depth == "detailed" else MOCK_OVERVIEW_SECTIONS,
+        "tone_notes": f"Use {tone} tone",
+        "audience_notes": f"Target {audience} developers"
+    }, option=orjson.OPT_INDENT_2).decode('utf-8')
+    for depth in ("overview", "detailed")
+    for tone in ("conversational", "explanatory", "marketing")
+    for audience in ("intermediate", "beginner", "advanced")
+}
+
+
+class MockLLMClient(LLMClient):
+    """Mock LLM client for testing and development."""
+    
+    supports_streaming = True
+    
+    def __init__(self, provider_name: str = "Mock", stream_delay: float = 0.01):
+        self.provider_name = provider_name
+        self.stream_delay = stream_delay  # simulated latency between streamed lines
+        logger.info(f"Initialized Mock LLM client for {provider_name}")
+    
+    def generate_content(self, prompt: str) -> Any:
+        """Generate mock content for testing."""
+        # Simple mock response based on prompt type; the prompt is scanned once
+        found = {keyword.lower() for keyword in _PROMPT_KEYWORDS_RE.findall(prompt)}
+        if "planner" in found:
+            # Determine tone from prompt
+            tone = "conversational"
+            if "explanatory" in found:
+                tone = "explanatory"
+            elif "marketing" in found:
+                tone = "marketing"
+            
+            # Determine depth from prompt
+            depth = "overview"
+            if "detailed" in found:
+                depth = "detailed"
+            
+            # Determine audience from prompt
+            audience = "intermediate"
+            if "beginner" in found:
+                audience = "beginner"
+            elif "advanced" in found:
+                audience = "advanced"
+            
+            return MockResponse(_MOCK_PLANS[depth, tone, audience])
+        else:
+            # Generate section content based on tone
+            tone = "conversational"
+            if "explanatory" in found:
+                tone = "explanatory"
+            elif "marketing" in found:
+                tone = "marketing"
             
-            return MockResponse(content)
+            # Every section at once, in the JSON format the batch prompt asks for
+            if "sections to write" in found:
+                match = _BATCH_SECTION_COUNT_RE.search(prompt)
+                count = int(match.group(1)) if match else 0
+                return MockResponse(orjson.dumps({"sections": [MOCK_SECTION_CONTENT[tone]] * count}).decode('utf-8'))
+            
+            return MockResponse(MOCK_SECTION_CONTENT[tone])
+    
+    async def agenerate_content(self, prompt: str) -> Any:
+        """Generate mock content asynchronously; it is instant, so no worker thread is needed."""
+        return self.generate_content(prompt)
+    
+    async def astream_content(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream mock content line by line, like a model generating it."""
+        response = self.generate_content(with_context(prompt, context))
+        for line in response.text.splitlines(keepends=True):
+            await asyncio.sleep(self.stream_delay)
+            yield line
     
     def get_model_name(self) -> str:
         """Get the model name for this client."""
@@ -234,6 +373,23 @@ class MockResponse:
         self.text = text
 
 
+def with_context(prompt: str, context: Optional[str]) -> str:
+    """
+    Put shared context ahead of a prompt as one string.
+    
+    The context comes first so that repeated requests share an identical prefix, which
+    providers with automatic prefix caching (OpenAI, Gemini) reuse.
+    """
+    return f"{context}\n\n{prompt}" if context else prompt
+
+
+def chunk_text(content: Any) -> str:
+    """Text of a streamed LangChain message chunk (a string or a list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+
+
 class RealLLMResponse:
     """Real LLM response object."""
     
@@ -245,11 +401,18 @@ class RealLLMResponse:
 class OpenAILLMClient(LLMClient):
     """OpenAI LLM client using LangChain."""
     
-    def __init__(self, api_key: str, model: str = "gpt-4"):
-        if not LANGCHAIN_AVAILABLE:
-            raise ImportError("LangChain OpenAI package not available")
+    supports_streaming = True
+    
+    def __init__(self, api_key: str, model: str = "gpt-4", max_concurrency: int = 8,
+                 requests_per_minute: Optional[float] = None):
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError:
+            raise ImportError("LangChain OpenAI package not available. Install with: pip install langchain-openai")
         
         self.model = model
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute or float(os.getenv("OPENAI_RPM", 3500))
         self.client = ChatOpenAI(
             openai_api_key=api_key,
             model=model,
@@ -267,6 +430,26 @@ class OpenAILLMClient(LLMClient):
             logger.error(f"OpenAI API error: {e}")
             raise
     
+    async def agenerate_content(self, prompt: str) -> RealLLMResponse:
+        """Generate content using OpenAI asynchronously."""
+        try:
+            async with self.rate_limiter():
+                response = await self.client.ainvoke(prompt)
+            return RealLLMResponse(response.content, self.model)
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+    
+    async def astream_content(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream content from OpenAI as it is generated."""
+        try:
+            async with self.rate_limiter():
+                async for chunk in self.client.astream(with_context(prompt, context)):
+                    yield chunk_text(chunk.content)
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+    
     def get_model_name(self) -> str:
         """Get the model name for this client."""
         return self.model
@@ -275,11 +458,18 @@ class OpenAILLMClient(LLMClient):
 class AnthropicLLMClient(LLMClient):
     """Anthropic LLM client using LangChain."""
     
-    def __init__(self, api_key: str, model: str = "claude-3-sonnet-20240229"):
-        if not LANGCHAIN_AVAILABLE:
-            raise ImportError("LangChain Anthropic package not available")
+    supports_streaming = True
+    
+    def __init__(self, api_key: str, model: str = "claude-3-sonnet-20240229", max_concurrency: int = 8,
+                 requests_per_minute: Optional[float] = None):
+        try:
+            from langchain_anthropic import ChatAnthropic
+        except ImportError:
+            raise ImportError("LangChain Anthropic package not available. Install with: pip install langchain-anthropic")
         
         self.model = model
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute or float(os.getenv("ANTHROPIC_RPM", 50))
         self.client = ChatAnthropic(
             anthropic_api_key=api_key,
             model=model,
@@ -297,6 +487,38 @@ class AnthropicLLMClient(LLMClient):
             logger.error(f"Anthropic API error: {e}")
             raise
     
+    async def agenerate_content(self, prompt: str) -> RealLLMResponse:
+        """Generate content using Anthropic asynchronously."""
+        try:
+            async with self.rate_limiter():
+                response = await self.client.ainvoke(prompt)
+            return RealLLMResponse(response.content, self.model)
+        except Exception as e:
+            logger.error(f"Anthropic API error: {e}")
+            raise
+    
+    async def astream_content(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream content from Anthropic as it is generated.
+        
+        Shared context is sent as its own content block marked for prompt caching,
+        so later requests with the same context read it from the cache.
+        """
+        messages = prompt
+        if context:
+            from langchain_core.messages import HumanMessage
+            messages = [HumanMessage(content=[
+                {"type": "text", "text": context, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt}
+            ])]
+        try:
+            async with self.rate_limiter():
+                async for chunk in self.client.astream(messages):
+                    yield chunk_text(chunk.content)
+        except Exception as e:
+            logger.error(f"Anthropic API error: {e}")
+            raise
+    
     def get_model_name(self) -> str:
         """Get the model name for this client."""
         return self.model
@@ -305,11 +527,18 @@ class AnthropicLLMClient(LLMClient):
 class GoogleLLMClient(LLMClient):
     """Google LLM client using LangChain."""
     
-    def __init__(self, api_key: str, model: str = "gemini-pro"):
-        if not LANGCHAIN_AVAILABLE:
-            raise ImportError("LangChain Google package not available")
+    supports_streaming = True
+    
+    def __init__(self, api_key: str, model: str = "gemini-pro", max_concurrency: int = 8,
+                 requests_per_minute: Optional[float] = None):
+        try:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+        except ImportError:
+            raise ImportError("LangChain Google package not available. Install with: pip install langchain-google-genai")
         
         self.model = model
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute or float(os.getenv("GOOGLE_RPM", 60))
         self.client = ChatGoogleGenerativeAI(
             google_api_key=api_key,
             model=model,
@@ -327,88 +556,518 @@ class GoogleLLMClient(LLMClient):
             logger.error(f"Google API error: {e}")
             raise
     
+    async def agenerate_content(self, prompt: str) -> RealLLMResponse:
+        """Generate content using Google asynchronously."""
+        try:
+            async with self.rate_limiter():
+                response = await self.client.ainvoke(prompt)
+            return RealLLMResponse(response.content, self.model)
+        except Exception as e:
+            logger.error(f"Google API error: {e}")
+            raise
+    
+    async def astream_content(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream content from Google as it is generated."""
+        try:
+            async with self.rate_limiter():
+                async for chunk in self.client.astream(with_context(prompt, context)):
+                    yield chunk_text(chunk.content)
+        except Exception as e:
+            logger.error(f"Google API error: {e}")
+            raise
+    
+    def get_model_name(self) -> str:
+        """Get the model name for this client."""
+        return self.model
+
+
+class OpenAIBatchClient(LLMClient):
+    """
+    OpenAI client using the Batch API, for jobs that are not time-sensitive.
+    
+    Prompts are uploaded as a JSONL file and completed asynchronously by OpenAI within
+    the completion window, at half the price of real-time requests. Results can take
+    minutes to hours, so this suits scheduled pipelines rather than the interactive app.
+    """
+    
+    # Batch states after which the job will not make further progress
+    TERMINAL_STATES = ("completed", "failed", "expired", "cancelled")
+    
+    def __init__(self, api_key: str, model: str = "gpt-4", poll_interval: float = 30.0,
+                 completion_window: str = "24h"):
+        try:
+            from openai import OpenAI
+        except ImportError:
+            raise ImportError("OpenAI package not available. Install with: pip install openai")
+        
+        self.model = model
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+        self.client = OpenAI(api_key=api_key)
+        logger.info(f"Initialized OpenAI Batch client with model {model}")
+    
+    def build_batch_file(self, prompts: List[str]) -> bytes:
+        """Build the JSONL batch input, one chat completion request per prompt."""
+        lines = [
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": 0.7,
+                    "max_tokens": 4000
+                }
+            })
+            for i, prompt in enumerate(prompts)
+        ]
+        return b"\n".join(lines)
+    
+    def parse_batch_output(self, output: str, count: int) -> List[RealLLMResponse]:
+        """Parse the JSONL batch output back into responses in prompt order."""
+        texts: List[Optional[str]] = [None] * count
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = orjson.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                raise RuntimeError(f"Batch request {result['custom_id']} failed: {result.get('error') or response}")
+            texts[int(result["custom_id"])] = response["body"]["choices"][0]["message"]["content"]
+        
+        missing = [i for i, text in enumerate(texts) if text is None]
+        if missing:
+            raise RuntimeError(f"Batch output is missing results for requests {missing}")
+        return [RealLLMResponse(text, self.model) for text in texts]
+    
+    def generate_batch(self, prompts: List[str]) -> List[RealLLMResponse]:
+        """Run prompts as one OpenAI batch job and wait for it to finish."""
+        try:
+            batch_file = self.client.files.create(
+                file=("batch.jsonl", self.build_batch_file(prompts)),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window=self.completion_window
+            )
+            logger.info(f"Submitted OpenAI batch {batch.id} with {len(prompts)} requests")
+            
+            while batch.status not in self.TERMINAL_STATES:
+                time.sleep(self.poll_interval)
+                batch = self.client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed":
+                raise RuntimeError(f"OpenAI batch {batch.id} ended with status '{batch.status}'")
+            
+            output = self.client.files.content(batch.output_file_id).text
+            return self.parse_batch_output(output, len(prompts))
+        except Exception as e:
+            logger.error(f"OpenAI Batch API error: {e}")
+            raise
+    
+    async def agenerate_batch(self, prompts: List[str]) -> List[RealLLMResponse]:
+        """Run prompts as one OpenAI batch job without blocking the event loop."""
+        return await asyncio.to_thread(self.generate_batch, prompts)
+    
+    def generate_content(self, prompt: str) -> RealLLMResponse:
+        """Generate content for a single prompt as a one-request batch job."""
+        return self.generate_batch([prompt])[0]
+    
     def get_model_name(self) -> str:
         """Get the model name for this client."""
         return self.model
 
 
+class CachingLLMClient(LLMClient):
+    """
+    Wraps an LLM client with a persistent response cache.
+    
+    Responses are keyed by the SHA-256 of the model, the full prompt and the sampling
+    temperature, so repeated requests (development iteration, retries) skip the API.
+    The wrapped clients sample at a non-zero temperature, so caching is opt-in.
+    """
+    
+    def __init__(self, client: LLMClient, cache_dir: str = ".llm_cache"):
+        self.client = client
+        self.cache = diskcache.Cache(cache_dir)
+        self.max_concurrency = client.max_concurrency
+        # LangChain chat models expose their sampling temperature; the mock has none
+        self.temperature = getattr(getattr(client, "client", None), "temperature", None)
+    
+    @property
+    def supports_streaming(self) -> bool:
+        """Cached clients stream exactly when the wrapped client does."""
+        return self.client.supports_streaming
+    
+    def cache_key(self, prompt: str) -> str:
+        """Build the cache key for a prompt sent to the wrapped model."""
+        payload = orjson.dumps({
+            "model": self.get_model_name(),
+            "prompt": prompt,
+            "temperature": self.temperature
+        })
+        return hashlib.sha256(payload).hexdigest()
+    
+    def generate_content(self, prompt: str) -> Any:
+        """Generate content, serving repeated prompts from the cache."""
+        key = self.cache_key(prompt)
+        text = self.cache.get(key)
+        if text is not None:
+            return RealLLMResponse(text, self.get_model_name())
+        
+        response = self.client.generate_content(prompt)
+        self.cache.set(key, response.text)
+        return response
+    
+    async def agenerate_content(self, prompt: str) -> Any:
+        """Generate content asynchronously, serving repeated prompts from the cache."""
+        key = self.cache_key(prompt)
+        text = self.cache.get(key)
+        if text is not None:
+            return RealLLMResponse(text, self.get_model_name())
+        
+        response = await self.client.agenerate_content(prompt)
+        self.cache.set(key, response.text)
+        return response
+    
+    async def astream_content(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream content; a cached response is yielded as one chunk."""
+        key = self.cache_key(with_context(prompt, context))
+        text = self.cache.get(key)
+        if text is not None:
+            yield text
+            return
+        
+        chunks = []
+        async for chunk in self.client.astream_content(prompt, context=context):
+            chunks.append(chunk)
+            yield chunk
+        # Only complete responses are cached
+        self.cache.set(key, "".join(chunks))
+    
+    def get_model_name(self) -> str:
+        """Get the model name of the wrapped client."""
+        return self.client.get_model_name()
+
+
+@lru_cache(maxsize=None)
+def load_embedding_model(name: str) -> Any:
+    """Load a sentence-transformers model once per process (it is large and stateless)."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+# Semantic response cache bounds: responses kept per partition (oldest dropped first)
+# and partitions kept in all (least recently used dropped first)
+SEMANTIC_PARTITION_ROWS = 256
+SEMANTIC_PARTITIONS = 64
+
+
+class SemanticCachingLLMClient(LLMClient):
+    """
+    Wraps an LLM client with an in-memory semantic response cache.
+    
+    Prompts are embedded with a small local model; a request whose prompt is a near
+    duplicate of an earlier one (cosine similarity at or above the threshold) is served
+    the earlier response. Requests are only matched within a partition: the same model,
+    the same scope and the same context. The scope identifies the project data behind
+    the prompts (see scoped()); without one, each distinct prompt is its own partition
+    and only exact repeats are served, since templated prompts for different projects
+    embed close together.
+    
+    Requires sentence-transformers; without it every request goes to the wrapped client.
+    """
+    
+    def __init__(self, client: LLMClient, similarity_threshold: float = 0.92,
+                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        self.client = client
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self.max_concurrency = client.max_concurrency
+        self.scope = None
+        
+        # Shared with the scoped() views of this client
+        self._lock = threading.Lock()
+        # partition hash -> (normalized embedding matrix, responses in row order), LRU order
+        self._partitions: "OrderedDict[str, Tuple[Any, List[str]]]" = OrderedDict()
+    
+    def scoped(self, scope: Optional[str]) -> "SemanticCachingLLMClient":
+        """
+        A view of this client whose requests only match requests with the same scope.
+        
+        The view shares the cache and embedding model; the workflow passes one per run,
+        scoped to a hash of the project data and generation settings.
+        """
+        view = copy.copy(self)
+        view.scope = scope
+        return view
+    
+    @property
+    def supports_streaming(self) -> bool:
+        """Cached clients stream exactly when the wrapped client does."""
+        return self.client.supports_streaming
+    
+    def _embed(self, prompt: str) -> Optional[Any]:
+        """Embed a prompt, or return None if the semantic cache is unavailable."""
+        if not SEMANTIC_CACHE_AVAILABLE:
+            return None
+        
+        try:
+            return load_embedding_model(self.embedding_model).encode(prompt, normalize_embeddings=True)
+        except Exception as e:
+            logger.warning(f"Failed to embed prompt for semantic cache: {e}")
+            return None
+    
+    def _lookup(self, partition: str, vector: Optional[Any]) -> Optional[str]:
+        """Return the cached response most similar to vector, if it is similar enough."""
+        if vector is None:
+            return None
+        
+        with self._lock:
+            entry = self._partitions.get(partition)
+            if entry is None:
+                return None
+            self._partitions.move_to_end(partition)
+            vectors, responses = entry
+        
+        # Embeddings are normalized, so a single matmul gives the cosine similarities.
+        # The entry is replaced, never mutated, so the rows and responses stay aligned.
+        similarities = vectors @ vector
+        best = int(similarities.argmax())
+        if similarities[best] >= self.similarity_threshold:
+            logger.info(f"LLM response cache hit (semantic, similarity {similarities[best]:.3f})")
+            return responses[best]
+        return None
+    
+    def _store(self, partition: str, vector: Optional[Any], text: str) -> None:
+        """Add a response to the cache under its prompt embedding."""
+        if vector is None:
+            return
+        
+        import numpy as np
+        
+        with self._lock:
+            entry = self._partitions.pop(partition, None)
+            if entry is None:
+                entry = (vector[np.newaxis, :], [text])
+            else:
+                vectors, responses = entry
+                entry = (np.vstack([vectors[-(SEMANTIC_PARTITION_ROWS - 1):], vector]),
+                         responses[-(SEMANTIC_PARTITION_ROWS - 1):] + [text])
+            self._partitions[partition] = entry
+            while len(self._partitions) > SEMANTIC_PARTITIONS:
+                self._partitions.popitem(last=False)
+    
+    def _partition(self, prompt: str, context: Optional[str]) -> str:
+        """Hash of the model, the scope and the context (or the whole prompt, if unscoped)."""
+        digest = hashlib.sha256(self.get_model_name().encode())
+        if self.scope is None:
+            digest.update(b"\0" + prompt.encode())
+        else:
+            digest.update(b"\0" + self.scope.encode())
+        digest.update(b"\0" + (context or "").encode())
+        return digest.hexdigest()
+    
+    def generate_content(self, prompt: str) -> Any:
+        """Generate content, serving near-duplicate prompts from the cache."""
+        partition = self._partition(prompt, None)
+        vector = self._embed(prompt)
+        text = self._lookup(partition, vector)
+        if text is not None:
+            return RealLLMResponse(text, self.get_model_name())
+        
+        response = self.client.generate_content(prompt)
+        self._store(partition, vector, response.text)
+        return response
+    
+    async def agenerate_content(self, prompt: str) -> Any:
+        """Generate content asynchronously, serving near-duplicate prompts from the cache."""
+        partition = self._partition(prompt, None)
+        vector = await asyncio.to_thread(self._embed, prompt)
+        text = self._lookup(partition, vector)
+        if text is not None:
+            return RealLLMResponse(text, self.get_model_name())
+        
+        response = await self.client.agenerate_content(prompt)
+        self._store(partition, vector, response.text)
+        return response
+    
+    async def astream_content(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream content; a cached response is yielded as one chunk."""
+        partition = self._partition(prompt, context)
+        vector = await asyncio.to_thread(self._embed, prompt)
+        text = self._lookup(partition, vector)
+        if text is not None:
+            yield text
+            return
+        
+        chunks = []
+        async for chunk in self.client.astream_content(prompt, context=context):
+            chunks.append(chunk)
+            yield chunk
+        # Only complete responses are cached
+        self._store(partition, vector, "".join(chunks))
+    
+    def get_model_name(self) -> str:
+        """Get the model name of the wrapped client."""
+        return self.client.get_model_name()
+
+
+# Provider name -> (client class, model, environment variable holding its API key)
+PROVIDERS: Final = {
+    "OpenAI GPT-4": (OpenAILLMClient, "gpt-4", "OPENAI_API_KEY"),
+    "Anthropic Claude": (AnthropicLLMClient, "claude-3-sonnet-20240229", "ANTHROPIC_API_KEY"),
+    "Google Gemini": (GoogleLLMClient, "gemini-pro", "GOOGLE_API_KEY")
+}
+
+# Providers whose requests can take minutes to hours (the half-price Batch API). They
+# are only available to factories created with allow_offline=True, for scheduled or
+# scripted runs - never to the interactive app.
+OFFLINE_PROVIDERS: Final = {
+    "OpenAI Batch": (OpenAIBatchClient, "gpt-4", "OPENAI_API_KEY")
+}
+
+# Example keys shipped in the sample configuration; treated as no key at all
+PLACEHOLDER_API_KEYS: Final = frozenset({
+    "your-openai-key-here",
+    "your-anthropic-key-here",
+    "your-google-api-key-here"
+})
+
+# Number of real clients kept alive for reuse
+CLIENT_CACHE_SIZE = 8
+
+
+def provider_spec(provider_name: str, allow_offline: bool = False) -> Optional[Tuple]:
+    """Look up a provider's (client class, model, env var), or None if it is not available."""
+    spec = PROVIDERS.get(provider_name)
+    if spec is None and allow_offline:
+        spec = OFFLINE_PROVIDERS.get(provider_name)
+    return spec
+
+
+def resolve_api_key(provider_name: str, api_key: Optional[str] = None,
+                    allow_offline: bool = False) -> Optional[str]:
+    """Use the given API key unless it is missing or a placeholder, else the provider's env var."""
+    if api_key and api_key not in PLACEHOLDER_API_KEYS:
+        return api_key
+    spec = provider_spec(provider_name, allow_offline)
+    return os.getenv(spec[2]) if spec else None
+
+
+def build_client(provider_name: str, api_key: Optional[str] = None,
+                 allow_offline: bool = False) -> LLMClient:
+    """
+    Construct a new LLM client, falling back to the mock client when the provider is
+    unknown (or offline-only and not allowed), no API key is available or the client
+    cannot be created.
+    """
+    spec = provider_spec(provider_name, allow_offline)
+    if spec is None:
+        if provider_name in OFFLINE_PROVIDERS:
+            logger.warning(f"Provider '{provider_name}' is only available to offline runs, using mock client")
+        else:
+            logger.warning(f"Unknown provider '{provider_name}', using mock client")
+        return MockLLMClient(provider_name)
+    
+    client_class, model, env_var = spec
+    api_key = resolve_api_key(provider_name, api_key, allow_offline)
+    if not api_key:
+        logger.warning(f"{env_var} not found, using mock client")
+        return MockLLMClient(provider_name)
+    
+    try:
+        return client_class(api_key, model)
+    except Exception as e:
+        logger.error(f"Failed to create {provider_name} client: {e}")
+        logger.info("Falling back to mock client")
+        return MockLLMClient(provider_name)
+
+
+# Real clients shared across the process, least recently used first, keyed by
+# (provider, SHA-256 of the API key) so the keys themselves are not held as cache keys
+_clients: "OrderedDict[Tuple[str, str], LLMClient]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def _get_client(provider_name: str, api_key: Optional[str], allow_offline: bool = False) -> LLMClient:
+    """
+    Get the shared client for a (provider, API key) pair, creating it on first use.
+    
+    Mock fallbacks are not shared, so a key that becomes available (or a transient
+    construction error) doesn't leave the provider mocked until restart.
+    """
+    resolved_key = resolve_api_key(provider_name, api_key, allow_offline)
+    if not resolved_key or provider_spec(provider_name, allow_offline) is None:
+        return build_client(provider_name, api_key, allow_offline)
+    
+    cache_key = (provider_name, hashlib.sha256(resolved_key.encode()).hexdigest())
+    with _clients_lock:
+        client = _clients.get(cache_key)
+        if client is not None:
+            _clients.move_to_end(cache_key)
+            return client
+    
+    client = build_client(provider_name, resolved_key, allow_offline)
+    if isinstance(client, MockLLMClient):
+        return client
+    
+    with _clients_lock:
+        # Another thread may have created the same client in the meantime
+        client = _clients.setdefault(cache_key, client)
+        _clients.move_to_end(cache_key)
+        while len(_clients) > CLIENT_CACHE_SIZE:
+            _clients.popitem(last=False)
+    return client
+
+
 class LLMFactory:
     """Factory for creating LLM clients based on provider selection."""
     
-    def __init__(self):
-        self.providers = {
-            "OpenAI GPT-4": self._create_openai_client,
-            "Anthropic Claude": self._create_anthropic_client,
-            "Google Gemini": self._create_google_client
-        }
+    def __init__(self, similarity_threshold: float = 0.92, allow_offline: bool = False):
+        """
+        Args:
+            similarity_threshold: Minimum cosine similarity for a semantic response cache hit
+            allow_offline: Also serve OFFLINE_PROVIDERS (e.g. the Batch API); only for
+                scripted runs that can wait minutes to hours for a result
+        """
+        self.similarity_threshold = similarity_threshold
+        self.allow_offline = allow_offline
+        self.providers = {**PROVIDERS, **OFFLINE_PROVIDERS} if allow_offline else PROVIDERS
     
-    def create_client(self, provider_name: str, api_key: str = None) -> LLMClient:
+    def create_client(self, provider_name: str, api_key: str = None, cache: bool = False,
+                      semantic_cache: bool = False) -> LLMClient:
         """
         Create an LLM client for the specified provider.
         
         Args:
             provider_name: Name of the LLM provider
             api_key: Optional API key (if not provided, will use environment variable)
+            cache: Serve repeated prompts from a persistent response cache
+            semantic_cache: Serve near-duplicate prompts from an in-memory semantic cache
             
         Returns:
             LLMClient instance
         """
-        if provider_name not in self.providers:
-            logger.warning(f"Unknown provider '{provider_name}', using mock client")
-            return MockLLMClient(provider_name)
-        
-        try:
-            if api_key and api_key != "your-openai-key-here" and api_key != "your-anthropic-key-here" and api_key != "your-google-api-key-here":
-                # Use provided API key (only if it's not a placeholder)
-                if provider_name == "OpenAI GPT-4":
-                    return OpenAILLMClient(api_key, "gpt-4")
-                elif provider_name == "Anthropic Claude":
-                    return AnthropicLLMClient(api_key, "claude-3-sonnet-20240229")
-                elif provider_name == "Google Gemini":
-                    return GoogleLLMClient(api_key, "gemini-pro")
-            else:
-                # Use environment variables
-                return self.providers[provider_name]()
-        except Exception as e:
-            logger.error(f"Failed to create {provider_name} client: {e}")
-            logger.info("Falling back to mock client")
-            return MockLLMClient(provider_name)
-    
-    def _create_openai_client(self) -> LLMClient:
-        """Create OpenAI client."""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            logger.warning("OPENAI_API_KEY not found, using mock client")
-            return MockLLMClient("OpenAI GPT-4")
-        
-        try:
-            return OpenAILLMClient(api_key, "gpt-4")
-        except Exception as e:
-            logger.error(f"Failed to create OpenAI client: {e}")
-            return MockLLMClient("OpenAI GPT-4")
-    
-    def _create_anthropic_client(self) -> LLMClient:
-        """Create Anthropic client."""
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            logger.warning("ANTHROPIC_API_KEY not found, using mock client")
-            return MockLLMClient("Anthropic Claude")
-        
-        try:
-            return AnthropicLLMClient(api_key, "claude-3-sonnet-20240229")
-        except Exception as e:
-            logger.error(f"Failed to create Anthropic client: {e}")
-            return MockLLMClient("Anthropic Claude")
-    
-    def _create_google_client(self) -> LLMClient:
-        """Create Google client."""
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            logger.warning("GOOGLE_API_KEY not found, using mock client")
-            return MockLLMClient("Google Gemini")
-        
-        try:
-            return GoogleLLMClient(api_key, "gemini-pro")
-        except Exception as e:
-            logger.error(f"Failed to create Google client: {e}")
-            return MockLLMClient("Google Gemini") 
\ No newline at end of file
+        # Clients are shared per (provider, API key) across the whole process, and so are
+        # their HTTP connection pools; cache wrappers around them are shared per settings.
+        # Mock responses are never cached, so they can't be served to a later real run.
+        client = _get_client(provider_name, api_key, self.allow_offline)
+        if isinstance(client, MockLLMClient) or (not cache and not semantic_cache):
+            return client
+        threshold = self.similarity_threshold if semantic_cache else None
+        return _make_caching_client(client, cache, threshold)
+
+
+@lru_cache(maxsize=8)
+def _make_caching_client(client: LLMClient, cache: bool,
+                         similarity_threshold: Optional[float]) -> LLMClient:
+    """Wrap a shared real client in the requested response caches."""
+    if cache:
+        client = CachingLLMClient(client)
+    if similarity_threshold is not None:
+        client = SemanticCachingLLMClient(client, similarity_threshold)
+    return client
@@ -11,31 +11,185 @@ and produce a structured, machine-readable summary of its contents that can be u
 """
 
 import os
+import hashlib
 import zipfile
 import tarfile
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import logging
 
+import diskcache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Buffer size for copying archive members to disk
+EXTRACT_CHUNK_SIZE = 64 * 1024
+
+# Extraction limits against archive bombs: total bytes written, as a multiple of the
+# upload size limit, and the number of archive members
+MAX_EXTRACTED_SIZE_RATIO = 5
+MAX_ARCHIVE_MEMBERS = 10_000
+
+# How long parsed projects stay in the on-disk parse cache, in seconds
+PARSE_CACHE_TTL = 24 * 60 * 60
+
+# Number of code files listed in the UI preview (code_files_head)
+CODE_FILES_PREVIEW = 10
+
+# Threads used to scan top-level project directories concurrently
+MAX_WALK_WORKERS = 8
+
+# Upper bound on concurrent file reads when capturing file contents
+MAX_READ_WORKERS = 16
+
+# Files opened and prefetched together, keeping well under the open-file limit
+PREFETCH_BATCH_SIZE = 256
+
+# Code excerpt length in detailed analysis, and the bytes read to fill it (also the cap
+# on captured README and config files). UTF-8 needs at most 4 bytes per character;
+# one extra byte detects truncation.
+CODE_EXCERPT_CHARS = 2000
+CODE_EXCERPT_READ_BYTES = CODE_EXCERPT_CHARS * 4 + 1
+
+# File categorization (FR-2): config files by name, code files by extension
+CONFIG_FILE_NAMES = frozenset({'package.json', 'requirements.txt', 'setup.py', 'pyproject.toml', 'Cargo.toml', 'go.mod'})
+CODE_EXTENSIONS_OVERVIEW = frozenset({'.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs'})
+CODE_EXTENSIONS_DETAILED = CODE_EXTENSIONS_OVERVIEW | {'.html', '.css', '.scss', '.sql'}
+
+# Columns of file_tree["files"], which lists every file column-wise (one list per
+# attribute) rather than as a record per file
+FILE_COLUMNS = ("name", "path", "full_path", "size")
+
+# The record lists in a file tree, which subtree scans produce and merge
+FILE_TREE_LISTS = ("directories", "readme_files", "config_files", "code_files")
+
+
+def archive_fingerprint(uploaded_file, max_bytes: Optional[int] = None) -> Optional[str]:
+    """
+    SHA-256 of an uploaded file, read in 1MB chunks instead of copying the whole archive.
+    
+    Args:
+        uploaded_file: Streamlit uploaded file object
+        max_bytes: If given, stop reading and return None once the file turns out to be
+            larger, so the size limit is enforced in the same pass as the hash
+    """
+    digest = hashlib.sha256()
+    total = 0
+    uploaded_file.seek(0)
+    try:
+        for chunk in iter(lambda: uploaded_file.read(1 << 20), b""):
+            total += len(chunk)
+            if max_bytes is not None and total > max_bytes:
+                return None
+            digest.update(chunk)
+    finally:
+        uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def _read_fd(fd: int, max_bytes: int) -> str:
+    """
+    Read up to max_bytes from an open file descriptor and decode them as UTF-8,
+    ignoring undecodable bytes.
+    """
+    data = os.read(fd, max_bytes)
+    while len(data) < max_bytes and (chunk := os.read(fd, max_bytes - len(data))):
+        data += chunk
+    return data.decode('utf-8', 'ignore')
+
+
+def _prefetch(paths: List[str], max_bytes: int) -> List[Union[int, Exception]]:
+    """
+    Open every file and ask the kernel to start reading it into the page cache.
+    
+    Args:
+        paths: Files to open
+        max_bytes: Bytes that will be read from each file
+    
+    Returns:
+        One entry per path: the open file descriptor, or the exception raised opening it
+    """
+    fds = []
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except Exception as e:
+            fds.append(e)
+            continue
+        if hasattr(os, "posix_fadvise"):  # not available on Windows/macOS
+            try:
+                os.posix_fadvise(fd, 0, max_bytes, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass  # only a hint
+        fds.append(fd)
+    return fds
+
+
+def _batch_read_files(paths: List[str], max_bytes: int) -> List[Union[str, Exception]]:
+    """
+    Read the start of many files concurrently, so their storage latency overlaps.
+    
+    All files are opened and prefetched (POSIX_FADV_WILLNEED) before any is read,
+    so the kernel's read-ahead for later files runs while earlier ones are consumed.
+    
+    Args:
+        paths: Files to read
+        max_bytes: Cap on the bytes read from each file
+    
+    Returns:
+        One entry per path, in order: the file's text, or the exception raised
+        while reading it
+    """
+    if not paths:
+        return []
+    
+    def read(fd: Union[int, Exception]) -> Union[str, Exception]:
+        if isinstance(fd, Exception):
+            return fd
+        try:
+            return _read_fd(fd, max_bytes)
+        except Exception as e:
+            return e
+    
+    contents = []
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(paths))) as executor:
+        # Bound the number of descriptors held open at once
+        for start in range(0, len(paths), PREFETCH_BATCH_SIZE):
+            fds = _prefetch(paths[start:start + PREFETCH_BATCH_SIZE], max_bytes)
+            try:
+                contents.extend(executor.map(read, fds))
+            finally:
+                for fd in fds:
+                    if not isinstance(fd, Exception):
+                        os.close(fd)
+    return contents
+
+
+class ArchiveLimitError(ValueError):
+    """An archive expands past the extraction limits."""
+
 
 class ProjectParser:
     """Handles project file parsing and analysis."""
     
-    def __init__(self, max_size_mb: int = 20):
+    def __init__(self, max_size_mb: int = 20, cache_dir: Optional[str] = None):
         """
         Initialize the parser with configuration.
         
         Args:
             max_size_mb: Maximum allowed file size in MB
+            cache_dir: Directory for an on-disk cache of parse results keyed by archive
+                contents, so re-parsing the same upload skips extraction and the walk
         """
         self.max_size_mb = max_size_mb
         self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_extracted_bytes = self.max_size_bytes * MAX_EXTRACTED_SIZE_RATIO
+        self.cache = diskcache.Cache(cache_dir) if cache_dir else None
         
         # Common ignore patterns from FR-2
         self.ignore_patterns = [
@@ -55,6 +209,11 @@ class ProjectParser:
             '.mypy_cache',
             '.ruff_cache'
         ]
+        
+        # Split the patterns once: names matched against whole path components,
+        # and the suffixes of the wildcard patterns
+        self._ignore_names = frozenset(p for p in self.ignore_patterns if not p.startswith('*'))
+        self._ignore_suffixes = tuple(p[1:] for p in self.ignore_patterns if p.startswith('*'))
     
     def validate_upload(self, uploaded_file) -> Tuple[bool, str]:
         """
@@ -92,23 +251,52 @@ class ProjectParser:
         Returns:
             Path to extracted directory or None if extraction fails
         """
+        temp_dir = None
         try:
             # Create temporary directory
             temp_dir = Path(tempfile.mkdtemp(prefix="project_analysis_"))
             logger.info(f"Created temporary directory: {temp_dir}")
             
-            # Extract based on file type
+            # Extract based on file type. Members and written bytes are counted as they
+            # go, so an archive bomb is stopped at the limits rather than by the disk.
             file_name = uploaded_file.name.lower()
+            written = 0
             
             if file_name.endswith('.zip'):
                 with zipfile.ZipFile(uploaded_file, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
+                    members = zip_ref.infolist()
+                    self._check_member_count(len(members))
+                    for member in members:
+                        if self._skip_member(member.filename, member.file_size):
+                            continue
+                        target = self._member_target(temp_dir, member.filename)
+                        if target is None:
+                            continue
+                        if member.is_dir():
+                            target.mkdir(parents=True, exist_ok=True)
+                            continue
+                        with zip_ref.open(member) as source:
+                            written += self._write_member(source, target, self.max_extracted_bytes - written)
                     
             elif file_name.endswith(('.tar.gz', '.tgz')):
-                with tarfile.open(fileobj=uploaded_file, mode='r:gz') as tar_ref:
-                    tar_ref.extractall(temp_dir)
+                # Stream mode reads members sequentially without seeking back
+                with tarfile.open(fileobj=uploaded_file, mode='r|gz') as tar_ref:
+                    for count, member in enumerate(tar_ref, 1):
+                        self._check_member_count(count)
+                        if self._skip_member(member.name, member.size):
+                            continue
+                        target = self._member_target(temp_dir, member.name)
+                        if target is None:
+                            continue
+                        if member.isdir():
+                            target.mkdir(parents=True, exist_ok=True)
+                        elif member.isfile():
+                            written += self._write_member(tar_ref.extractfile(member), target,
+                                                          self.max_extracted_bytes - written)
+                        # Links and special files are skipped
             else:
                 logger.error(f"Unsupported file type: {file_name}")
+                self.cleanup_temp_directory(temp_dir)
                 return None
             
             logger.info(f"Successfully extracted archive to {temp_dir}")
@@ -116,7 +304,81 @@ class ProjectParser:
             
         except Exception as e:
             logger.error(f"Failed to extract archive: {str(e)}")
+            if temp_dir is not None:
+                self.cleanup_temp_directory(temp_dir)
+            return None
+    
+    def _check_member_count(self, count: int) -> None:
+        """Raise ArchiveLimitError once an archive has more than MAX_ARCHIVE_MEMBERS members."""
+        if count > MAX_ARCHIVE_MEMBERS:
+            raise ArchiveLimitError(f"archive has more than {MAX_ARCHIVE_MEMBERS} members")
+    
+    def _skip_member(self, member_name: str, size: int) -> bool:
+        """
+        Decide whether an archive member can be left out of the extraction.
+        
+        Members under ignored paths (.git, node_modules, *.pyc, ...) would be skipped by
+        generate_file_tree anyway, so they are never written to disk. Members declaring
+        more than the whole upload limit are skipped too; the total extracted size is
+        enforced separately, as members are written.
+        
+        Args:
+            member_name: Path of the member inside the archive
+            size: Uncompressed size of the member in bytes
+            
+        Returns:
+            True if the member should not be extracted
+        """
+        if self.should_ignore_path(Path(member_name)):
+            return True
+        if size > self.max_size_bytes:
+            logger.warning(f"Skipping archive member larger than {self.max_size_mb}MB: {member_name}")
+            return True
+        return False
+    
+    def _member_target(self, temp_dir: Path, member_name: str) -> Optional[Path]:
+        """
+        Resolve where an archive member should be written.
+        
+        Args:
+            temp_dir: Extraction directory
+            member_name: Path of the member inside the archive
+            
+        Returns:
+            Destination path, or None if the member would escape temp_dir
+        """
+        target = (temp_dir / member_name).resolve()
+        if not target.is_relative_to(temp_dir.resolve()):
+            logger.warning(f"Skipping archive member outside extraction directory: {member_name}")
             return None
+        return target
+    
+    def _write_member(self, source, target: Path, max_bytes: int) -> int:
+        """
+        Copy an archive member's file object to disk in fixed-size chunks.
+        
+        Args:
+            source: Readable file object for the member
+            target: Destination path
+            max_bytes: Extraction budget left; the actual bytes are counted, not the
+                size the archive declares
+            
+        Returns:
+            Number of bytes written
+            
+        Raises:
+            ArchiveLimitError: If the member would take the extraction past its budget
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with open(target, 'wb') as dest:
+            while chunk := source.read(EXTRACT_CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise ArchiveLimitError(
+                        f"archive expands past {self.max_extracted_bytes // (1024 * 1024)}MB")
+                dest.write(chunk)
+        return written
     
     def should_ignore_path(self, path: Path) -> bool:
         """
@@ -128,19 +390,120 @@ class ProjectParser:
         Returns:
             True if path should be ignored
         """
-        path_str = str(path)
+        # A directory/file pattern matches a whole component (so 'env' does not
+        # match 'environment.py'); a wildcard pattern matches the file name's ending
+        return not self._ignore_names.isdisjoint(path.parts) or path.name.endswith(self._ignore_suffixes)
+    
+    def _is_ignored_name(self, name: str) -> bool:
+        """Check a single file or directory name against the ignore patterns."""
+        return name in self._ignore_names or name.endswith(self._ignore_suffixes)
+    
+    def _iter_directory(self, root: str, relative_root: str, depth: str,
+                        subdirs: List[Tuple[str, str]]) -> Iterator[Tuple[Optional[str], str, str, str, int]]:
+        """
+        Scan one directory, yielding its files and collecting its subdirectories.
         
-        for pattern in self.ignore_patterns:
-            if pattern.startswith('*'):
-                # Handle wildcard patterns
-                if path_str.endswith(pattern[1:]):
-                    return True
-            else:
-                # Handle directory/file patterns
-                if pattern in path_str:
-                    return True
+        Args:
+            root: Directory to scan
+            relative_root: Its path relative to the project, ending in a separator (or "")
+            depth: Analysis depth ("overview" or "detailed")
+            subdirs: List that receives (full path, relative path) of each subdirectory
+                that is not ignored
+            
+        Yields:
+            (category, name, relative path, full path, size) per file, where category is
+            "readme_files", "config_files", "code_files" or None
+        """
+        # os.scandir entries carry their type and stat result, so no extra syscalls are
+        # needed per file. Ignored directories are never entered, so only each entry's
+        # own name needs checking against the ignore patterns.
+        with os.scandir(root) as entries:
+            # Process files: loop through all files in the project directory
+            for entry in entries:
+                file = entry.name
+                if self._is_ignored_name(file):
+                    continue
+                
+                relative_path = relative_root + file
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, relative_path))
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                
+                suffix = os.path.splitext(file)[1]
+                
+                # Categorize files based on depth requirements
+                category = None
+                if depth == "overview":
+                    # For overview depth, focus on key files (FR-2)
+                    if file.lower().startswith('readme'):
+                        category = "readme_files"
+                    elif file in CONFIG_FILE_NAMES:
+                        category = "config_files"
+                    elif suffix in CODE_EXTENSIONS_OVERVIEW and relative_path.count(os.sep) <= 1:
+                        # Only top-level code files for overview
+                        category = "code_files"
+                elif suffix in CODE_EXTENSIONS_DETAILED:
+                    # For detailed depth, include all code files
+                    category = "code_files"
+                
+                yield category, file, relative_path, entry.path, entry.stat(follow_symlinks=False).st_size
+    
+    def _scan_directory(self, root: str, relative_root: str, depth: str, file_tree: Dict) -> List[Tuple[str, str]]:
+        """
+        Add one directory's files and subdirectories to a file tree.
         
-        return False
+        Args:
+            root: Directory to scan
+            relative_root: Its path relative to the project, ending in a separator (or "")
+            depth: Analysis depth ("overview" or "detailed")
+            file_tree: File tree lists to append to
+            
+        Returns:
+            (full path, relative path) of each subdirectory that is not ignored
+        """
+        subdirs = []
+        files = file_tree["files"]
+        names, paths, full_paths, sizes = files["name"], files["path"], files["full_path"], files["size"]
+        
+        for category, name, path, full_path, size in self._iter_directory(root, relative_root, depth, subdirs):
+            names.append(name)
+            paths.append(path)
+            full_paths.append(full_path)
+            sizes.append(size)
+            
+            # Only categorized files, which the workflow reads, get a record of their own
+            if category is not None:
+                file_tree[category].append({"name": name, "path": path, "full_path": full_path, "size": size})
+        
+        # Add directory information
+        for dir_path, relative_dir_path in subdirs:
+            file_tree["directories"].append({
+                "name": os.path.basename(dir_path),
+                "path": relative_dir_path
+            })
+        
+        return subdirs
+    
+    def _scan_subtree(self, root: str, relative_root: str, depth: str) -> Dict:
+        """
+        Scan a directory and everything below it, depth-first in os.walk order.
+        
+        Returns:
+            Dictionary with the subtree's files columns and its directories/readme_files/
+            config_files/code_files records
+        """
+        subtree = {key: [] for key in FILE_TREE_LISTS}
+        subtree["files"] = {column: [] for column in FILE_COLUMNS}
+        stack = [(root, relative_root)]
+        while stack:
+            directory, relative_directory = stack.pop()
+            subdirs = self._scan_directory(directory, relative_directory, depth, subtree)
+            # Pushed in reverse so the first subdirectory is scanned next
+            stack.extend((dir_path, relative_dir_path + os.sep)
+                         for dir_path, relative_dir_path in reversed(subdirs))
+        return subtree
     
     def generate_file_tree(self, project_dir: Path, depth: str = "overview") -> Dict:
         """
@@ -151,11 +514,13 @@ class ProjectParser:
             depth: Analysis depth ("overview" or "detailed")
             
         Returns:
-            Dictionary containing file tree and metadata
+            Dictionary containing file tree and metadata. "files" holds every file as
+            columns ({"name": [...], "path": [...], "full_path": [...], "size": [...]});
+            the categorized lists hold one {"name", "path", "full_path", "size"} per file
         """
         file_tree = {
             "root": str(project_dir),
-            "files": [],
+            "files": {column: [] for column in FILE_COLUMNS},
             "directories": [],
             "readme_files": [],
             "config_files": [],
@@ -163,56 +528,26 @@ class ProjectParser:
         }
         
         try:
-            # Walk through the project directory
-            for root, dirs, files in os.walk(project_dir):
-                root_path = Path(root)
-                
-                # Filter directories
-                dirs[:] = [d for d in dirs if not self.should_ignore_path(root_path / d)]
-                
-                # Process files: loop through all files in the project directory
-                for file in files:
-                    file_path = root_path / file
-                    
-                    if self.should_ignore_path(file_path):
-                        continue
-                    
-                    relative_path = file_path.relative_to(project_dir)
-                    file_info = {
-                        "name": file,
-                        "path": str(relative_path),
-                        "full_path": str(file_path),
-                        "size": file_path.stat().st_size if file_path.exists() else 0
-                    }
-                    
-                    file_tree["files"].append(file_info)
-                    
-                    # Categorize files based on depth requirements
-                    if depth == "overview":
-                        # For overview depth, focus on key files (FR-2)
-                        if file.lower().startswith('readme'):
-                            file_tree["readme_files"].append(file_info)
-                        elif file in ['package.json', 'requirements.txt', 'setup.py', 'pyproject.toml', 'Cargo.toml', 'go.mod']:
-                            file_tree["config_files"].append(file_info)
-                        elif file_path.suffix in ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs']:
-                            # Only top-level code files for overview
-                            if len(relative_path.parts) <= 2:
-                                file_tree["code_files"].append(file_info)
-                    else:
-                        # For detailed depth, include all code files
-                        if file_path.suffix in ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs', '.html', '.css', '.scss', '.sql']:
-                            file_tree["code_files"].append(file_info)
-                
-                # Add directory information
-                for dir_name in dirs:
-                    dir_path = root_path / dir_name
-                    relative_dir_path = dir_path.relative_to(project_dir)
-                    file_tree["directories"].append({
-                        "name": dir_name,
-                        "path": str(relative_dir_path)
-                    })
+            top_level_dirs = self._scan_directory(str(project_dir), "", depth, file_tree)
+            
+            # Top-level subtrees are independent, so they are scanned concurrently (the
+            # GIL is released during the scandir/stat syscalls) and merged in order,
+            # giving the same result as a sequential walk
+            subtree_args = [(dir_path, relative_dir_path + os.sep, depth)
+                            for dir_path, relative_dir_path in top_level_dirs]
+            if len(subtree_args) > 1:
+                with ThreadPoolExecutor(max_workers=min(MAX_WALK_WORKERS, len(subtree_args))) as executor:
+                    subtrees = list(executor.map(lambda args: self._scan_subtree(*args), subtree_args))
+            else:
+                subtrees = [self._scan_subtree(*args) for args in subtree_args]
+            
+            for subtree in subtrees:
+                for column in FILE_COLUMNS:
+                    file_tree["files"][column].extend(subtree["files"][column])
+                for key in FILE_TREE_LISTS:
+                    file_tree[key].extend(subtree[key])
             
-            logger.info(f"Generated file tree with {len(file_tree['files'])} files")
+            logger.info(f"Generated file tree with {len(file_tree['files']['path'])} files")
             return file_tree
             
         except Exception as e:
@@ -233,13 +568,15 @@ class ProjectParser:
         except Exception as e:
             logger.error(f"Failed to cleanup temporary directory {temp_dir}: {str(e)}")
     
-    def process_project(self, uploaded_file, depth: str = "overview") -> Optional[Dict]:
+    def process_project(self, uploaded_file, depth: str = "overview",
+                        fingerprint: Optional[str] = None) -> Optional[Dict]:
         """
         Main method to process uploaded project file.
         
         Args:
             uploaded_file: Streamlit uploaded file object
             depth: Analysis depth ("overview" or "detailed")
+            fingerprint: archive_fingerprint(uploaded_file), if the caller already has it
             
         Returns:
             Dictionary with project analysis results or None if processing fails
@@ -250,6 +587,58 @@ class ProjectParser:
             logger.error(f"Upload validation failed: {error_msg}")
             return None
         
+        # Serve a previous parse of the same archive at the same depth
+        cache_key = None
+        if self.cache is not None:
+            if fingerprint is None:
+                # Hash and check the actual size (not just the reported one) in one read
+                fingerprint = archive_fingerprint(uploaded_file, self.max_size_bytes)
+                if fingerprint is None:
+                    logger.error(f"Upload validation failed: file exceeds maximum allowed size ({self.max_size_mb}MB)")
+                    return None
+            cache_key = (fingerprint, depth)
+            result = self.cache.get(cache_key)
+            if result is not None:
+                logger.info("Parse cache hit")
+                return result
+        
+        result = self._parse_archive(uploaded_file, depth)
+        if result is not None and cache_key is not None:
+            self.cache.set(cache_key, result, expire=PARSE_CACHE_TTL)
+        return result
+    
+    def capture_file_contents(self, file_tree: Dict, depth: str) -> Dict[str, str]:
+        """
+        Read the files the article prompts quote, while the archive is still extracted.
+        
+        The temporary directory is removed as soon as parsing finishes, so the workflow
+        works from these captured contents rather than from the files themselves.
+        
+        Args:
+            file_tree: The project's file tree
+            depth: Analysis depth; code file excerpts are only captured for "detailed"
+            
+        Returns:
+            File text by relative path, each read up to CODE_EXCERPT_READ_BYTES (README
+            and config files, plus code files for "detailed"). The text is carried in the
+            analysis, checkpoints and caches, so no file is captured whole. Files that
+            can't be read are left out.
+        """
+        files = file_tree["readme_files"] + file_tree["config_files"]
+        if depth == "detailed":
+            files += file_tree["code_files"]
+        
+        contents = _batch_read_files([f["full_path"] for f in files], CODE_EXCERPT_READ_BYTES)
+        captured = {}
+        for file_info, content in zip(files, contents):
+            if isinstance(content, Exception):
+                logger.warning(f"Failed to read {file_info['path']}: {str(content)}")
+            else:
+                captured[file_info["path"]] = content
+        return captured
+    
+    def _parse_archive(self, uploaded_file, depth: str) -> Optional[Dict]:
+        """Extract a validated archive and analyze it (the uncached part of process_project)."""
         # Extract archive
         temp_dir = self.extract_archive(uploaded_file)
         if temp_dir is None:
@@ -263,10 +652,12 @@ class ProjectParser:
             result = {
                 "file_tree": file_tree,
                 "analysis_depth": depth,
-                "total_files": len(file_tree["files"]),
+                "total_files": len(file_tree["files"]["path"]),
                 "code_files": len(file_tree["code_files"]),
+                "code_files_head": file_tree["code_files"][:CODE_FILES_PREVIEW],
                 "readme_files": len(file_tree["readme_files"]),
-                "config_files": len(file_tree["config_files"])
+                "config_files": len(file_tree["config_files"]),
+                "file_contents": self.capture_file_contents(file_tree, depth)
             }
             
             return result
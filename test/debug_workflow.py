@@ -4,39 +4,62 @@ Detailed LangGraph Workflow Debug Script
 This script shows the state transformation at each step of the workflow.
 """
 
-import json
-from pprint import pprint
+import sys
+import asyncio
+import concurrent.futures
 from graph import ArticleGenerationWorkflow
 from services.llm_factory import MockLLMClient
 from graph.nodes import PreProcessingNode, SectionPlannerNode, ContentGeneratorNode, PostProcessorNode
 
+# Sample project analysis shared by the tests below (the files don't need to exist)
+SAMPLE_PROJECT_ANALYSIS = {
+    "file_tree": {
+        "readme_files": [
+            {"path": "README.md", "full_path": "/tmp/test/README.md"}
+        ],
+        "config_files": [
+            {"path": "requirements.txt", "full_path": "/tmp/test/requirements.txt"}
+        ],
+        "code_files": [
+            {"path": "main.py", "name": "main.py", "full_path": "/tmp/test/main.py", "size": 67}
+        ],
+        "files": {"name": [], "path": [], "full_path": [], "size": []},
+        "directories": []
+    },
+    "analysis_depth": "detailed",
+    "total_files": 3,
+    "code_files": 1,
+    "readme_files": 1,
+    "config_files": 1,
+    # Text the parser captures before removing the extracted archive
+    "file_contents": {
+        "README.md": "# Sample Project\n\nA small command-line tool that greets its user.\n",
+        "requirements.txt": "click>=8.0\n",
+        "main.py": "import click\n\n@click.command()\ndef main():\n    click.echo('Hello')\n"
+    }
+}
+
+# Lowercase markers of each article tone: every group needs at least one match
+TONE_MARKERS = {
+    "marketing": (("🚀", "amazing"),),
+    "conversational": ((" i ", "i'm"), ("you",)),
+    "explanatory": (("this section provides",),)
+}
+
+def write_lines(lines):
+    """Write the collected output lines to stdout in one call and clear them."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
 def debug_workflow_step_by_step():
     """Debug the workflow by running each node individually and showing state changes."""
-    print("🔍 Detailed LangGraph Workflow Debug")
-    print("=" * 60)
+    # Output is collected and written once per step, just before each node runs
+    output = []
+    output.append("🔍 Detailed LangGraph Workflow Debug")
+    output.append("=" * 60)
     
     # Sample data
-    sample_project_analysis = {
-        "file_tree": {
-            "readme_files": [
-                {"path": "README.md", "full_path": "/tmp/test/README.md"}
-            ],
-            "config_files": [
-                {"path": "requirements.txt", "full_path": "/tmp/test/requirements.txt"}
-            ],
-            "code_files": [
-                {"path": "main.py", "full_path": "/tmp/test/main.py"}
-            ],
-            "files": [],
-            "directories": []
-        },
-        "analysis_depth": "detailed",
-        "total_files": 3,
-        "code_files": 1,
-        "readme_files": 1,
-        "config_files": 1
-    }
-    
     sample_config = {
         "analysis_depth": "detailed",
         "article_tone": "marketing",
@@ -47,7 +70,7 @@ def debug_workflow_step_by_step():
     
     # Initial state
     initial_state = {
-        "project_analysis": sample_project_analysis,
+        "project_analysis": SAMPLE_PROJECT_ANALYSIS,
         "config": sample_config,
         "extracted_content": None,
         "article_plan": None,
@@ -56,82 +79,94 @@ def debug_workflow_step_by_step():
         "error": None
     }
     
-    print("\n📋 Initial State:")
-    print("-" * 30)
-    print(f"• project_analysis: {type(initial_state['project_analysis'])}")
-    print(f"• config: {type(initial_state['config'])}")
-    print(f"• extracted_content: {initial_state['extracted_content']}")
-    print(f"• article_plan: {initial_state['article_plan']}")
-    print(f"• generated_sections: {initial_state['generated_sections']}")
-    print(f"• final_article: {initial_state['final_article']}")
-    print(f"• error: {initial_state['error']}")
+    output.append("\n📋 Initial State:")
+    output.append("-" * 30)
+    output.append(f"• project_analysis: {type(initial_state['project_analysis'])}")
+    output.append(f"• config: {type(initial_state['config'])}")
+    output.append(f"• extracted_content: {initial_state['extracted_content']}")
+    output.append(f"• article_plan: {initial_state['article_plan']}")
+    output.append(f"• generated_sections: {initial_state['generated_sections']}")
+    output.append(f"• final_article: {initial_state['final_article']}")
+    output.append(f"• error: {initial_state['error']}")
+    
+    # Nodes update the state in place and return it, so each step's result is
+    # printed before the next node runs rather than copied
     
     # Step 1: PreProcessingNode
-    print("\n🔄 Step 1: PreProcessingNode")
-    print("-" * 30)
+    output.append("\n🔄 Step 1: PreProcessingNode")
+    output.append("-" * 30)
     pre_processor = PreProcessingNode()
-    state_after_preprocessing = pre_processor(initial_state.copy())
+    write_lines(output)
+    state_after_preprocessing = pre_processor(initial_state)
     
-    print("✅ PreProcessingNode completed")
-    print(f"• extracted_content keys: {list(state_after_preprocessing['extracted_content'].keys())}")
-    print(f"• readme_content length: {len(state_after_preprocessing['extracted_content']['readme_content'])} chars")
-    print(f"• config_content length: {len(state_after_preprocessing['extracted_content']['config_content'])} chars")
-    print(f"• code_files_info length: {len(state_after_preprocessing['extracted_content']['code_files_info'])} chars")
+    extracted_content = state_after_preprocessing['extracted_content']
+    output.append("✅ PreProcessingNode completed")
+    output.append(f"• extracted_content keys: {list(extracted_content)}")
+    output.append(f"• readme_content length: {len(extracted_content['readme_content'])} chars")
+    output.append(f"• config_content length: {len(extracted_content['config_content'])} chars")
+    output.append(f"• code_files_info length: {len(extracted_content['code_files_info'])} chars")
     
     # Step 2: SectionPlannerNode
-    print("\n🔄 Step 2: SectionPlannerNode")
-    print("-" * 30)
+    output.append("\n🔄 Step 2: SectionPlannerNode")
+    output.append("-" * 30)
     mock_llm = MockLLMClient("Test")
     section_planner = SectionPlannerNode(mock_llm)
-    state_after_planning = section_planner(state_after_preprocessing.copy())
+    write_lines(output)
+    state_after_planning = asyncio.run(section_planner(state_after_preprocessing))
     
-    print("✅ SectionPlannerNode completed")
-    print(f"• article_plan keys: {list(state_after_planning['article_plan'].keys())}")
-    print(f"• title: {state_after_planning['article_plan']['title']}")
-    print(f"• sections count: {len(state_after_planning['article_plan']['sections'])}")
-    print(f"• tone_notes: {state_after_planning['article_plan']['tone_notes']}")
-    print(f"• audience_notes: {state_after_planning['article_plan']['audience_notes']}")
+    article_plan = state_after_planning['article_plan']
+    output.append("✅ SectionPlannerNode completed")
+    output.append(f"• article_plan keys: {list(article_plan)}")
+    output.append(f"• title: {article_plan['title']}")
+    output.append(f"• sections count: {len(article_plan['sections'])}")
+    output.append(f"• tone_notes: {article_plan['tone_notes']}")
+    output.append(f"• audience_notes: {article_plan['audience_notes']}")
     
     # Show section details
-    print("\n📝 Generated Sections Plan:")
-    for i, section in enumerate(state_after_planning['article_plan']['sections']):
-        print(f"  {i+1}. {section['heading']} ({section['content_type']})")
-        print(f"     Key points: {', '.join(section['key_points'])}")
-        print(f"     Length: {section['estimated_length']}")
+    output.append("\n📝 Generated Sections Plan:")
+    for i, section in enumerate(article_plan['sections']):
+        output.append(f"  {i+1}. {section['heading']} ({section['content_type']})")
+        output.append(f"     Key points: {', '.join(section['key_points'])}")
+        output.append(f"     Length: {section['estimated_length']}")
     
     # Step 3: ContentGeneratorNode
-    print("\n🔄 Step 3: ContentGeneratorNode")
-    print("-" * 30)
+    output.append("\n🔄 Step 3: ContentGeneratorNode")
+    output.append("-" * 30)
     content_generator = ContentGeneratorNode(mock_llm)
-    state_after_content = content_generator(state_after_planning.copy())
+    write_lines(output)
+    state_after_content = asyncio.run(content_generator(state_after_planning))
     
-    print("✅ ContentGeneratorNode completed")
-    print(f"• generated_sections count: {len(state_after_content['generated_sections'])}")
+    output.append("✅ ContentGeneratorNode completed")
+    output.append(f"• generated_sections count: {len(state_after_content['generated_sections'])}")
     
     # Show content preview for each section
-    print("\n📄 Generated Content Preview:")
+    output.append("\n📄 Generated Content Preview:")
     for i, section_content in enumerate(state_after_content['generated_sections']):
-        print(f"\n  Section {i+1}:")
-        print(f"  Length: {len(section_content)} characters")
-        print(f"  Preview: {section_content[:100]}...")
+        output.append(f"\n  Section {i+1}:")
+        output.append(f"  Length: {len(section_content)} characters")
+        output.append(f"  Preview: {section_content[:100]}...")
     
     # Step 4: PostProcessorNode
-    print("\n🔄 Step 4: PostProcessorNode")
-    print("-" * 30)
+    output.append("\n🔄 Step 4: PostProcessorNode")
+    output.append("-" * 30)
     post_processor = PostProcessorNode()
-    final_state = post_processor(state_after_content.copy())
+    write_lines(output)
+    final_state = post_processor(state_after_content)
     
-    print("✅ PostProcessorNode completed")
-    print(f"• final_article length: {len(final_state['final_article'])} characters")
+    output.append("✅ PostProcessorNode completed")
+    output.append(f"• final_article length: {len(final_state['final_article'])} characters")
     
     # Show final article structure
-    print("\n📄 Final Article Structure:")
-    lines = final_state['final_article'].split('\n')
-    for i, line in enumerate(lines[:20]):  # Show first 20 lines
+    output.append("\n📄 Final Article Structure:")
+    # Only the first 20 lines are shown, so split off just those and count the rest
+    final_article = final_state['final_article']
+    line_count = final_article.count('\n') + 1
+    for i, line in enumerate(final_article.split('\n', 20)[:20]):  # Show first 20 lines
         if line.strip():
-            print(f"  {i+1:2d}: {line}")
-    if len(lines) > 20:
-        print(f"  ... and {len(lines) - 20} more lines")
+            output.append(f"  {i+1:2d}: {line}")
+    if line_count > 20:
+        output.append(f"  ... and {line_count - 20} more lines")
+    write_lines(output)
     
     return final_state
 
@@ -149,7 +184,8 @@ def test_workflow_with_different_configs():
                 "article_tone": "explanatory",
                 "llm_provider": "Mock",
                 "article_title": "Beginner-Friendly Project",
-                "target_audience": "beginner"
+                "target_audience": "beginner",
+                "thread_id": "debug-explanatory-beginner"
             }
         },
         {
@@ -159,7 +195,8 @@ def test_workflow_with_different_configs():
                 "article_tone": "marketing",
                 "llm_provider": "Mock",
                 "article_title": "Advanced Project Showcase",
-                "target_audience": "advanced"
+                "target_audience": "advanced",
+                "thread_id": "debug-marketing-advanced"
             }
         },
         {
@@ -169,54 +206,51 @@ def test_workflow_with_different_configs():
                 "article_tone": "conversational",
                 "llm_provider": "Mock",
                 "article_title": "My Cool Project",
-                "target_audience": "intermediate"
+                "target_audience": "intermediate",
+                "thread_id": "debug-conversational-intermediate"
             }
         }
     ]
     
-    sample_project_analysis = {
-        "file_tree": {
-            "readme_files": [{"path": "README.md", "full_path": "/tmp/test/README.md"}],
-            "config_files": [{"path": "requirements.txt", "full_path": "/tmp/test/requirements.txt"}],
-            "code_files": [{"path": "main.py", "full_path": "/tmp/test/main.py"}],
-            "files": [],
-            "directories": []
-        },
-        "analysis_depth": "detailed",
-        "total_files": 3,
-        "code_files": 1,
-        "readme_files": 1,
-        "config_files": 1
-    }
-    
     workflow = ArticleGenerationWorkflow()
+    # The graph is compiled on first use and shared by every run
+    compiled_graph = workflow._get_workflow()
     
-    for test_config in configs:
-        print(f"\n🔧 Testing: {test_config['name']}")
-        print("-" * 30)
+    # The configurations are independent, so run them side by side; each one has its
+    # own thread_id so the runs don't share (or resume from) each other's checkpoints
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(configs)) as executor:
+        futures = {
+            executor.submit(workflow.run_workflow, SAMPLE_PROJECT_ANALYSIS, test_config['config']): test_config
+            for test_config in configs
+        }
         
-        try:
-            result = workflow.run_workflow(sample_project_analysis, test_config['config'])
+        for future in concurrent.futures.as_completed(futures):
+            test_config = futures[future]
+            print(f"\n🔧 Testing: {test_config['name']}")
+            print("-" * 30)
             
-            if result["success"]:
-                print(f"✅ Success! Article length: {len(result['article'])} chars")
+            try:
+                result = future.result()
                 
-                # Show tone-specific content
-                if "marketing" in test_config['config']['article_tone']:
-                    if "🚀" in result['article'] or "amazing" in result['article'].lower():
-                        print("✅ Marketing tone detected in content")
-                elif "conversational" in test_config['config']['article_tone']:
-                    if "I" in result['article'] and "you" in result['article']:
-                        print("✅ Conversational tone detected in content")
-                elif "explanatory" in test_config['config']['article_tone']:
-                    if "This section provides" in result['article']:
-                        print("✅ Explanatory tone detected in content")
+                if result["success"]:
+                    print(f"✅ Success! Article length: {len(result['article'])} chars")
                 
-            else:
-                print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+                    # Show tone-specific content
+                    tone = test_config['config']['article_tone']
+                    article_lower = result['article'].lower()
+                    marker_groups = TONE_MARKERS.get(tone, ())
+                    if marker_groups and all(any(marker in article_lower for marker in group)
+                                             for group in marker_groups):
+                        print(f"✅ {tone.capitalize()} tone detected in content")
                 
-        except Exception as e:
-            print(f"❌ Exception: {e}")
+                else:
+                    print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+                
+            except Exception as e:
+                print(f"❌ Exception: {e}")
+    
+    assert workflow._get_workflow() is compiled_graph, "workflow graph was recompiled between runs"
+    print("\n✅ All configurations ran on one compiled graph")
 
 def main():
     """Run all debug tests."""
@@ -8,19 +8,81 @@ the integration is working correctly.
 
 import os
 import sys
+import asyncio
+from typing import List, Tuple
 from dotenv import load_dotenv
 from services.llm_factory import LLMFactory
 
 # Load environment variables from .env file
 load_dotenv()
 
+async def check_provider(factory: LLMFactory, provider_name: str, env_var: str) -> List[str]:
+    """Test one provider and return its report lines (printed once all providers finish)."""
+    lines = [f"\n🔍 Testing {provider_name}..."]
+    
+    # Check if API key is available
+    api_key = os.getenv(env_var)
+    if not api_key:
+        lines.append(f"   ⚠️  {env_var} not found in environment")
+        lines.append(f"   📝 Using mock client for {provider_name}")
+        
+        # Test with mock client
+        try:
+            client = factory.create_client(provider_name)
+            response = await client.agenerate_content("Hello, this is a test!")
+            lines.append(f"   ✅ Mock client works: {type(response).__name__}")
+            lines.append(f"   📄 Response preview: {response.text[:100]}...")
+        except Exception as e:
+            lines.append(f"   ❌ Mock client failed: {e}")
+    else:
+        lines.append(f"   🔑 API key found: {api_key[:10]}...")
+        
+        # Test with real client; responses are cached on disk (.llm_cache/), so
+        # re-running the script doesn't repeat the API calls
+        try:
+            client = factory.create_client(provider_name, api_key, cache=True)
+            lines.append(f"   ✅ Real client created: {client.get_model_name()}")
+            
+            # Test a simple prompt
+            test_prompt = "Write a one-sentence summary of Python programming."
+            response = await client.agenerate_content(test_prompt)
+            lines.append(f"   📄 Real response: {response.text}")
+            
+        except Exception as e:
+            lines.append(f"   ❌ Real client failed: {e}")
+            lines.append(f"   🔄 Falling back to mock client...")
+            
+            # Fallback to mock
+            try:
+                client = factory.create_client(provider_name)
+                response = await client.agenerate_content("Hello, this is a test!")
+                lines.append(f"   ✅ Mock fallback works")
+            except Exception as e2:
+                lines.append(f"   ❌ Mock fallback also failed: {e2}")
+    
+    return lines
+
+async def check_providers(providers: List[Tuple[str, str]]) -> None:
+    """Test all providers concurrently, then print their reports in order."""
+    factory = LLMFactory()
+    
+    # The API calls are independent, so one slow or failing provider doesn't hold up the rest
+    reports = await asyncio.gather(
+        *(check_provider(factory, provider_name, env_var) for provider_name, env_var in providers),
+        return_exceptions=True
+    )
+    
+    for (provider_name, _), report in zip(providers, reports):
+        if isinstance(report, Exception):
+            print(f"\n❌ Testing {provider_name} failed: {report}")
+        else:
+            print("\n".join(report))
+
 def test_llm_integration():
     """Test LLM integration with different providers."""
     print("🧪 Testing Real LLM Integration")
     print("=" * 50)
     
-    factory = LLMFactory()
-    
     # Test providers
     providers = [
         ("OpenAI GPT-4", "OPENAI_API_KEY"),
@@ -28,47 +90,7 @@ def test_llm_integration():
         ("Google Gemini", "GOOGLE_API_KEY")
     ]
     
-    for provider_name, env_var in providers:
-        print(f"\n🔍 Testing {provider_name}...")
-        
-        # Check if API key is available
-        api_key = os.getenv(env_var)
-        if not api_key:
-            print(f"   ⚠️  {env_var} not found in environment")
-            print(f"   📝 Using mock client for {provider_name}")
-            
-            # Test with mock client
-            try:
-                client = factory.create_client(provider_name)
-                response = client.generate_content("Hello, this is a test!")
-                print(f"   ✅ Mock client works: {type(response).__name__}")
-                print(f"   📄 Response preview: {response.text[:100]}...")
-            except Exception as e:
-                print(f"   ❌ Mock client failed: {e}")
-        else:
-            print(f"   🔑 API key found: {api_key[:10]}...")
-            
-            # Test with real client
-            try:
-                client = factory.create_client(provider_name, api_key)
-                print(f"   ✅ Real client created: {client.get_model_name()}")
-                
-                # Test a simple prompt
-                test_prompt = "Write a one-sentence summary of Python programming."
-                response = client.generate_content(test_prompt)
-                print(f"   📄 Real response: {response.text}")
-                
-            except Exception as e:
-                print(f"   ❌ Real client failed: {e}")
-                print(f"   🔄 Falling back to mock client...")
-                
-                # Fallback to mock
-                try:
-                    client = factory.create_client(provider_name)
-                    response = client.generate_content("Hello, this is a test!")
-                    print(f"   ✅ Mock fallback works")
-                except Exception as e2:
-                    print(f"   ❌ Mock fallback also failed: {e2}")
+    asyncio.run(check_providers(providers))
     
     print("\n" + "=" * 50)
     print("🎉 LLM Integration Test Complete!")
@@ -4,11 +4,37 @@ LangGraph Workflow Visualization
 This script helps visualize the workflow structure and test individual components.
 """
 
-import json
-from pathlib import Path
+import asyncio
 from graph import ArticleGenerationWorkflow
 from services.llm_factory import MockLLMClient
-from services.parser import ProjectParser
+
+# Sample project analysis shared by the tests below (the files don't need to exist)
+SAMPLE_PROJECT_ANALYSIS = {
+    "file_tree": {
+        "readme_files": [
+            {"path": "README.md", "full_path": "/tmp/test/README.md"}
+        ],
+        "config_files": [
+            {"path": "requirements.txt", "full_path": "/tmp/test/requirements.txt"}
+        ],
+        "code_files": [
+            {"path": "main.py", "name": "main.py", "full_path": "/tmp/test/main.py", "size": 67}
+        ],
+        "files": {"name": [], "path": [], "full_path": [], "size": []},
+        "directories": []
+    },
+    "analysis_depth": "detailed",
+    "total_files": 3,
+    "code_files": 1,
+    "readme_files": 1,
+    "config_files": 1,
+    # Text the parser captures before removing the extracted archive
+    "file_contents": {
+        "README.md": "# Sample Project\n\nA small command-line tool that greets its user.\n",
+        "requirements.txt": "click>=8.0\n",
+        "main.py": "import click\n\n@click.command()\ndef main():\n    click.echo('Hello')\n"
+    }
+}
 
 def visualize_workflow_structure():
     """Visualize the LangGraph workflow structure."""
@@ -84,26 +110,7 @@ def test_individual_nodes():
     print("=" * 30)
     
     # Sample data
-    sample_project_analysis = {
-        "file_tree": {
-            "readme_files": [
-                {"path": "README.md", "full_path": "/tmp/test/README.md"}
-            ],
-            "config_files": [
-                {"path": "requirements.txt", "full_path": "/tmp/test/requirements.txt"}
-            ],
-            "code_files": [
-                {"path": "main.py", "full_path": "/tmp/test/main.py"}
-            ],
-            "files": [],
-            "directories": []
-        },
-        "analysis_depth": "overview",
-        "total_files": 3,
-        "code_files": 1,
-        "readme_files": 1,
-        "config_files": 1
-    }
+    sample_project_analysis = {**SAMPLE_PROJECT_ANALYSIS, "analysis_depth": "overview"}
     
     sample_config = {
         "analysis_depth": "overview",
@@ -143,7 +150,7 @@ def test_individual_nodes():
     planner = SectionPlannerNode(mock_llm)
     
     try:
-        result_state = planner(result_state)
+        result_state = asyncio.run(planner(result_state))
         print("✅ SectionPlannerNode completed successfully")
         print(f"   - Generated {len(result_state['article_plan']['sections'])} sections")
         print(f"   - Title: {result_state['article_plan']['title']}")
@@ -157,7 +164,7 @@ def test_individual_nodes():
     generator = ContentGeneratorNode(mock_llm)
     
     try:
-        result_state = generator(result_state)
+        result_state = asyncio.run(generator(result_state))
         print("✅ ContentGeneratorNode completed successfully")
         print(f"   - Generated {len(result_state['generated_sections'])} sections")
     except Exception as e:
@@ -184,27 +191,6 @@ def test_full_workflow():
     print("=" * 40)
     
     # Create sample data
-    sample_project_analysis = {
-        "file_tree": {
-            "readme_files": [
-                {"path": "README.md", "full_path": "/tmp/test/README.md"}
-            ],
-            "config_files": [
-                {"path": "requirements.txt", "full_path": "/tmp/test/requirements.txt"}
-            ],
-            "code_files": [
-                {"path": "main.py", "full_path": "/tmp/test/main.py"}
-            ],
-            "files": [],
-            "directories": []
-        },
-        "analysis_depth": "detailed",
-        "total_files": 3,
-        "code_files": 1,
-        "readme_files": 1,
-        "config_files": 1
-    }
-    
     sample_config = {
         "analysis_depth": "detailed",
         "article_tone": "marketing",
@@ -217,7 +203,7 @@ def test_full_workflow():
     workflow = ArticleGenerationWorkflow()
     
     try:
-        result = workflow.run_workflow(sample_project_analysis, sample_config)
+        result = workflow.run_workflow(SAMPLE_PROJECT_ANALYSIS, sample_config)
         
         if result["success"]:
             print("✅ Full workflow completed successfully!")
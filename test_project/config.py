@@ -8,7 +8,21 @@ This module handles application configuration including:
 """
 
 import os
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+def _parse_bool(value: str) -> bool:
+    """Interpret an environment variable as a boolean flag."""
+    return value.lower() in ("true", "1", "yes")
+
+# Environment variable -> (configuration key, converter for its value)
+ENV_MAPPINGS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "APP_NAME": ("app_name", str),
+    "APP_VERSION": ("version", str),
+    "DEBUG": ("debug", _parse_bool),
+    "OUTPUT_DIR": ("output_dir", str),
+    "MAX_ITEMS": ("max_items", int)
+}
 
 class Config:
     """Configuration manager for the application."""
@@ -22,30 +36,17 @@ class Config:
             "output_dir": "output",
             "max_items": 100
         }
+        self._view = MappingProxyType(self._config) # read-only, always up to date
         
         # Override with environment variables
         self._load_from_env()
     
     def _load_from_env(self):
         """Load configuration from environment variables."""
-        env_mappings = {
-            "APP_NAME": "app_name",
-            "APP_VERSION": "version", 
-            "DEBUG": "debug",
-            "OUTPUT_DIR": "output_dir",
-            "MAX_ITEMS": "max_items"
-        }
-        
-        for env_var, config_key in env_mappings.items():
-            value = os.getenv(env_var)
+        for env_var, (config_key, convert) in ENV_MAPPINGS.items():
+            value = os.environ.get(env_var)
             if value is not None:
-                # Convert boolean values
-                if config_key == "debug":
-                    self._config[config_key] = value.lower() in ("true", "1", "yes")
-                elif config_key == "max_items":
-                    self._config[config_key] = int(value)
-                else:
-                    self._config[config_key] = value
+                self._config[config_key] = convert(value)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value."""
@@ -55,6 +56,8 @@ class Config:
         """Set configuration value."""
         self._config[key] = value
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Get configuration as dictionary."""
-        return self._config.copy() 
\ No newline at end of file
+    def to_dict(self, copy: bool = False) -> Mapping[str, Any]:
+        """Get configuration as a read-only mapping, or as a new dictionary if copy is set."""
+        if copy:
+            return self._config.copy()
+        return self._view 
\ No newline at end of file
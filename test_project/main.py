@@ -31,7 +31,7 @@ def main():
         
         # Save results
         output_file = Path("output.txt")
-        save_results(processed_data, output_file)
+        save_results(processed_data, output_file, pretty=config.get("debug", False))
         print(f"✅ Results saved to {output_file}")
         
         print("🎉 Application completed successfully!")
@@ -8,10 +8,34 @@ This module provides common utility functions including:
 """
 
 import json
+import itertools
 from pathlib import Path
 from typing import List, Any, Dict
 
-def process_data(data: List[str]) -> List[Dict[str, Any]]:
+import numpy as np
+
+# orjson is much faster than the standard library; fall back to json without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One record per processed item, stored column by column
+PROCESSED_DTYPE = np.dtype([
+    ("id", "i4"),
+    ("original", "O"),
+    ("processed", "O"),
+    ("length", "i4"),
+    ("uppercase", "O")
+])
+
+# Output files are written through a 1 MiB buffer
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Output directories already created by this process
+_ENSURED_DIRS = set()
+
+def process_data(data: List[str]) -> np.ndarray:
     """
     Process a list of data items.
     
@@ -19,44 +43,76 @@ def process_data(data: List[str]) -> List[Dict[str, Any]]:
         data: List of string items to process
         
     Returns:
-        List of processed data dictionaries
+        Structured array of processed records (see PROCESSED_DTYPE)
     """
-    processed = []
+    processed = np.empty(len(data), dtype=PROCESSED_DTYPE)
     
-    for i, item in enumerate(data):
-        processed_item = {
-            "id": i + 1,
-            "original": item,
-            "processed": f"processed_{item}",
-            "length": len(item),
-            "uppercase": item.upper()
-        }
-        processed.append(processed_item)
+    # The string columns are filled from Python str methods: numpy's fixed-width
+    # string ops keep each item's width, so case mappings that change the length
+    # (e.g. 'ß' -> 'SS') would be truncated
+    processed["id"] = np.arange(1, len(data) + 1)
+    processed["original"] = data
+    processed["processed"] = [f"processed_{item}" for item in data]
+    processed["length"] = [len(item) for item in data]
+    processed["uppercase"] = [item.upper() for item in data]
     
     return processed
 
-def save_results(data: List[Dict[str, Any]], output_file: Path):
+def to_records(data: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Convert processed data to a list of plain dictionaries.
+    
+    Args:
+        data: Structured array returned by process_data
+        
+    Returns:
+        List of processed data dictionaries
+    """
+    return [dict(zip(data.dtype.names, row)) for row in data.tolist()]
+
+def ensure_directory(directory: Path):
+    """
+    Create a directory (and its parents) the first time it is needed.
+    
+    Args:
+        directory: Directory that output will be written to
+    """
+    if directory not in _ENSURED_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+def save_results(data: np.ndarray, output_file: Path, pretty: bool = False):
     """
     Save processed data to a file.
     
     Args:
-        data: List of processed data dictionaries
+        data: Structured array returned by process_data
         output_file: Path to output file
+        pretty: Indent the JSON output (slower and larger, meant for debugging)
     """
     # Ensure output directory exists
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+    ensure_directory(output_file.parent)
     
     # Save as JSON
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    records = to_records(data)
+    if orjson is not None:
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        with open(output_file, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+            if pretty:
+                json.dump(records, f, indent=2)
+            else:
+                json.dump(records, f, separators=(",", ":"))
     
     # Also save a summary
     summary_file = output_file.parent / f"{output_file.stem}_summary.txt"
-    with open(summary_file, 'w') as f:
-        f.write(f"Processed {len(data)} items\n")
-        f.write("=" * 30 + "\n")
-        for item in data:
-            f.write(f"ID: {item['id']}, Original: {item['original']}\n")
+    with open(summary_file, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(f"Processed {len(data)} items\n" + "=" * 30 + "\n")
+        f.writelines(
+            f"ID: {item_id}, Original: {original}\n"
+            for item_id, original in zip(data["id"].tolist(), data["original"])
+        )
 
 def validate_data(data: List[str]) -> bool:
     """
@@ -68,38 +124,37 @@ def validate_data(data: List[str]) -> bool:
     Returns:
         True if data is valid, False otherwise
     """
-    if not isinstance(data, list):
-        return False
-    
-    if len(data) == 0:
-        return False
-    
-    for item in data:
-        if not isinstance(item, str):
-            return False
-        if len(item.strip()) == 0:
-            return False
-    
-    return True
+    # Every item must be a string with something left after stripping whitespace;
+    # all() stops at the first invalid item
+    return (
+        isinstance(data, list)
+        and len(data) > 0
+        and all(isinstance(item, str) and item.strip() for item in data)
+    )
 
-def format_output(data: List[Dict[str, Any]]) -> str:
+def format_output(data: np.ndarray) -> str:
     """
     Format processed data as a readable string.
     
     Args:
-        data: List of processed data dictionaries
+        data: Structured array returned by process_data
         
     Returns:
         Formatted string representation
     """
-    lines = ["Processed Data Summary", "=" * 25]
+    header = ["Processed Data Summary", "=" * 25]
     
-    for item in data:
-        lines.append(f"ID: {item['id']}")
-        lines.append(f"  Original: {item['original']}")
-        lines.append(f"  Processed: {item['processed']}")
-        lines.append(f"  Length: {item['length']}")
-        lines.append(f"  Uppercase: {item['uppercase']}")
-        lines.append("")
+    # One block per item (ending in a blank line), read straight from the columns
+    blocks = (
+        f"ID: {item_id}\n"
+        f"  Original: {original}\n"
+        f"  Processed: {processed}\n"
+        f"  Length: {length}\n"
+        f"  Uppercase: {uppercase}\n"
+        for item_id, original, processed, length, uppercase in zip(
+            data["id"].tolist(), data["original"], data["processed"],
+            data["length"].tolist(), data["uppercase"]
+        )
+    )
     
-    return "\n".join(lines) 
\ No newline at end of file
+    return "\n".join(itertools.chain(header, blocks)) 
\ No newline at end of file